@@ -42,6 +42,8 @@ collection = chroma.get_or_create_collection(
 
 EMBED_MODEL = os.getenv("EMBED_MODEL", "text-embedding-3-small")
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "64"))
+# Entries per Chroma upsert; bounded by the client's own max batch size
+ADD_BATCH_SIZE = min(int(os.getenv("CHROMA_ADD_BATCH_SIZE", "256")), chroma.get_max_batch_size())
 RETRY_SLEEP = 2
 
 # Max tokens for text-embedding-3-small is 8191
@@ -142,17 +144,24 @@ def embed_texts(texts: List[str]) -> List[List[float]]:
 
 def add_to_chroma(ids, docs, embeddings, metadatas=None):
     """
-    Add or update documents in chroma collection.
+    Add or update documents in chroma collection, ADD_BATCH_SIZE entries per call.
     Uses upsert to handle duplicates - updates if exists, inserts if new.
     PersistentClient automatically persists to disk, no manual persist() needed.
     """
+    metadatas = metadatas or [{}]*len(ids)
+    for i in range(0, len(ids), ADD_BATCH_SIZE):
+        j = i + ADD_BATCH_SIZE
+        _add_batch_to_chroma(ids[i:j], docs[i:j], embeddings[i:j], metadatas[i:j])
+
+def _add_batch_to_chroma(ids, docs, embeddings, metadatas):
+    """Upsert one batch, falling back to add() if upsert fails."""
     try:
         # Try upsert first - updates existing or inserts new
         collection.upsert(
             ids=ids,
             documents=docs,
             embeddings=embeddings,
-            metadatas=metadatas or [{}]*len(ids)
+            metadatas=metadatas
         )
         logger.debug(f"Upserted {len(ids)} documents (may have updated existing)")
     except Exception as e:
@@ -1,16 +1,22 @@
 """Multi-Agent Orchestrator - Coordinates all agents."""
 
+import time
 import logging
-from typing import List, Dict, Any
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from .stock_search_agent import StockSearchAgent
 from .stock_categorization_agent import StockCategorizationAgent
 from .stock_analysis_agent import StockAnalysisAgent
-from ..types import Stock, StockAnalysis
+from ..types import Stock, StockAnalysis, StockCategory, AgentResult
 
 
 logger = logging.getLogger(__name__)
 
+# Search results carry live quotes, so they are only reused briefly
+SEARCH_CACHE_TTL = 900
+SEARCH_CACHE_SIZE = 64
+
 
 class MultiAgentOrchestrator:
     """
@@ -27,13 +33,21 @@ class MultiAgentOrchestrator:
         self.search_agent = StockSearchAgent()
         self.categorization_agent = StockCategorizationAgent()
         self.analysis_agent = StockAnalysisAgent()
+        # "sector|date" -> (monotonic time, successful search result)
+        self._search_cache: Dict[str, Tuple[float, AgentResult]] = {}
     
-    async def process_sector_query(self, sector: str) -> Dict[str, Any]:
+    async def process_sector_query(
+        self,
+        sector: str,
+        progress_callback: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
         """
         Main orchestration method: Search sector, categorize, and analyze.
         
         Args:
             sector: The sector to analyze
+            progress_callback: Optional coroutine called with each stock's
+                formatted analysis as soon as it completes
             
         Returns:
             Dictionary with comprehensive analysis results
@@ -43,7 +57,7 @@ class MultiAgentOrchestrator:
         try:
             # Step 1: Search for stocks in the sector
             logger.info("Step 1: Searching for stocks...")
-            search_result = await self.search_agent.search_stocks_by_sector(sector)
+            search_result = await self._search_stocks(sector)
             
             if not search_result.success or not search_result.data:
                 return {
@@ -79,12 +93,14 @@ class MultiAgentOrchestrator:
                 f"{len(medium_stocks)} medium, {len(low_stocks)} low\n"
             )
             
-            # Step 3: Analyze stocks in each category
+            # Step 3: Analyze all stocks concurrently, grouped back by category
             logger.info("Step 3: Analyzing stocks...")
             
-            high_analyses = await self._analyze_category(high_stocks, "high")
-            medium_analyses = await self._analyze_category(medium_stocks, "medium")
-            low_analyses = await self._analyze_category(low_stocks, "low")
+            analyses, dropped = await self._analyze_stocks({
+                StockCategory.HIGH: high_stocks,
+                StockCategory.MEDIUM: medium_stocks,
+                StockCategory.LOW: low_stocks,
+            }, progress_callback)
             
             logger.info("\n=== Analysis Complete ===\n")
             
@@ -93,15 +109,12 @@ class MultiAgentOrchestrator:
                 "sector": sector,
                 "total_stocks": len(stocks),
                 "categorized_stocks": {
-                    "high": [s.model_dump() for s in high_stocks],
-                    "medium": [s.model_dump() for s in medium_stocks],
-                    "low": [s.model_dump() for s in low_stocks],
+                    "high": categorized["high"],
+                    "medium": categorized["medium"],
+                    "low": categorized["low"],
                 },
-                "analyses": {
-                    "high": high_analyses,
-                    "medium": medium_analyses,
-                    "low": low_analyses,
-                }
+                "analyses": analyses,
+                "dropped": dropped
             }
         except Exception as e:
             logger.error(f"Orchestration failed: {e}")
@@ -112,25 +125,73 @@ class MultiAgentOrchestrator:
                 "error": f"Orchestration failed: {str(e)}"
             }
     
-    async def _analyze_category(
-        self, 
-        stocks: List[Stock], 
-        category_name: str
-    ) -> List[Dict[str, Any]]:
-        """Analyze stocks in a specific category."""
-        logger.info(f"Analyzing {len(stocks)} {category_name} stocks...")
-        
-        analyses = []
-        
-        for stock in stocks:
-            category = self.categorization_agent.get_category_for_stock(stock)
-            analysis_result = await self.analysis_agent.analyze_stock(stock, category)
-            
-            if analysis_result.success and analysis_result.data:
-                analyses.append(analysis_result.data["analysis"])
+    async def aclose(self):
+        """Release network resources held by the agents."""
+        await self.search_agent.aclose()
+    
+    async def _search_stocks(self, sector: str) -> AgentResult:
+        """Search a sector, reusing a recent successful result for the same sector and day."""
+        key = f"{sector.strip().lower()}|{date.today().isoformat()}"
+        now = time.monotonic()
+        
+        cached = self._search_cache.get(key)
+        if cached is not None and now - cached[0] < SEARCH_CACHE_TTL:
+            logger.info(f"Using cached search results for {sector}")
+            return cached[1]
         
-        logger.info(f"Completed analysis for {category_name} category")
-        return analyses
+        result = await self.search_agent.search_stocks_by_sector(sector)
+        if result.success:
+            self._search_cache[key] = (now, result)
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                # Drop expired entries first, then the oldest if still over
+                self._search_cache = {
+                    k: v for k, v in self._search_cache.items()
+                    if now - v[0] < SEARCH_CACHE_TTL
+                }
+                while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                    del self._search_cache[next(iter(self._search_cache))]
+        return result
+    
+    async def _analyze_stocks(
+        self,
+        stocks_by_category: Dict[StockCategory, List[Stock]],
+        progress_callback: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> Tuple[Dict[str, List[StockAnalysis]], List[str]]:
+        """
+        Analyze already-categorized stocks concurrently and group the analyses by category.
+        
+        Delegates to analyze_multiple_stocks, which shares one batched price
+        download and bounds concurrency. Returns the grouped analyses and the
+        symbols that could not be analyzed.
+        """
+        # Reuse the categorization instead of re-classifying each stock
+        category_of = {
+            stock.symbol: category
+            for category, group in stocks_by_category.items()
+            for stock in group
+        }
+        stocks = [stock for group in stocks_by_category.values() for stock in group]
+        logger.info(f"Analyzing {len(stocks)} stocks...")
+        
+        grouped: Dict[str, List[StockAnalysis]] = {c.value: [] for c in StockCategory}
+        
+        on_result = None
+        if progress_callback is not None:
+            async def on_result(analysis: StockAnalysis):
+                await progress_callback(self._format_category_analysis([analysis]))
+        
+        result = await self.analysis_agent.analyze_multiple_stocks(
+            stocks, lambda stock: category_of[stock.symbol], on_result=on_result
+        )
+        if not result.success or not result.data:
+            logger.error(f"Analysis failed: {result.error}")
+            return grouped, [stock.symbol for stock in stocks]
+        
+        for analysis in result.data["analyses"]:
+            grouped[analysis.category.value].append(analysis)
+        
+        logger.info(f"Completed analysis for {len(result.data['analyses'])} stocks")
+        return grouped, result.data["dropped"]
     
     def format_results(self, result: Dict[str, Any]) -> str:
         """Format results for display."""
@@ -170,18 +231,25 @@ class MultiAgentOrchestrator:
             lines.append("─" * 80)
             lines.append(self._format_category_analysis(analyses["low"]))
         
+        # Stocks that timed out or failed upstream, so a partial report says so
+        if result.get("dropped"):
+            lines.append("\n" + "─" * 80)
+            lines.append(f"⚠️  Not analyzed ({len(result['dropped'])}): {', '.join(result['dropped'])}")
+            lines.append("   These stocks timed out or their data source was unavailable.")
+        
         lines.append("\n" + "=" * 80)
         lines.append("END OF REPORT")
         lines.append("=" * 80)
         
         return "\n".join(lines)
     
-    def _format_category_analysis(self, analyses: List[Dict[str, Any]]) -> str:
+    def _format_category_analysis(self, analyses: List[StockAnalysis]) -> str:
         """Format analysis for a category."""
         lines = []
         
-        for analysis_data in analyses:
-            analysis = StockAnalysis(**analysis_data)
+        for analysis in analyses:
+            if isinstance(analysis, dict):
+                analysis = StockAnalysis(**analysis)
             stock = analysis.stock
             
             lines.append(f"\n📊 {stock.symbol} - {stock.name}")
@@ -1,6 +1,8 @@
 """Real API Integration Examples for Stock Search Agent."""
 
 import os
+import time
+import weakref
 import logging
 from typing import List, Optional
 import asyncio
@@ -13,10 +15,10 @@ except ImportError:
     HAS_YFINANCE = False
 
 try:
-    import requests
-    HAS_REQUESTS = True
+    import httpx
+    HAS_HTTPX = True
 except ImportError:
-    HAS_REQUESTS = False
+    HAS_HTTPX = False
 
 from ..types import Stock
 
@@ -30,6 +32,135 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+# API keys are read once at import time; call reload_keys() after rotating them
+_ALPHA_VANTAGE_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
+_POLYGON_KEY = os.getenv("POLYGON_API_KEY")
+_FMP_KEY = os.getenv("FMP_API_KEY")
+_NASDAQ_KEY = os.getenv("NASDAQ_DATA_LINK_KEY")
+
+
+# Strips the trailing "%" from Alpha Vantage change percentages
+_PERCENT_TRANS = str.maketrans("", "", "%")
+
+
+# Shared HTTP client so repeat calls to the same provider reuse keep-alive connections.
+# One per event loop: pooled connections are bound to the loop that opened them, and
+# callers like gradio_app.py run each query under a fresh asyncio.run().
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_client() -> "httpx.AsyncClient":
+    """Get or create the running loop's shared HTTP client used by all providers."""
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _CLIENTS[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=20,
+                keepalive_expiry=30,
+            ),
+            timeout=httpx.Timeout(10.0, connect=3.0),
+        )
+    return client
+
+
+async def aclose():
+    """Close the running loop's shared HTTP client."""
+    client = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def reload_keys():
+    """Re-read provider API keys from the environment."""
+    global _ALPHA_VANTAGE_KEY, _POLYGON_KEY, _FMP_KEY, _NASDAQ_KEY, _fetcher_instance
+    _ALPHA_VANTAGE_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
+    _POLYGON_KEY = os.getenv("POLYGON_API_KEY")
+    _FMP_KEY = os.getenv("FMP_API_KEY")
+    _NASDAQ_KEY = os.getenv("NASDAQ_DATA_LINK_KEY")
+    # The shared fetcher copies keys at init, rebuild it on next use
+    _fetcher_instance = None
+
+
+class AdaptiveBucket:
+    """
+    Client-side token bucket that fails fast while a provider is unhealthy.
+    
+    Successes credit a token and failures (429/5xx/network errors) debit
+    fail_cost, so a short run of failures drains the bucket. A drained bucket
+    refuses every call for cooldown seconds; after that, calls are allowed
+    again while at least one token has trickled back in, and a further
+    failure re-opens it straight away.
+    
+    The refill rate is slower than a token per fail_cost seconds so failures
+    spaced out by a provider's own rate-limit sleep (12s for Alpha Vantage)
+    still drain it.
+    """
+    
+    def __init__(
+        self,
+        capacity: float = 20,
+        fail_cost: float = 5,
+        refill_per_sec: float = 0.1,
+        cooldown: float = 30.0
+    ):
+        self.capacity = capacity
+        self.fail_cost = fail_cost
+        self.refill_per_sec = refill_per_sec
+        self.cooldown = cooldown
+        self.tokens = capacity
+        self._last = time.monotonic()
+        self._open_until = 0.0
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.refill_per_sec)
+        self._last = now
+    
+    def allow(self) -> bool:
+        now = time.monotonic()
+        if now < self._open_until:
+            return False
+        self._refill(now)
+        return self.tokens >= 1
+    
+    def on_success(self):
+        self.tokens = min(self.capacity, self.tokens + 1)
+    
+    def on_fail(self):
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = max(0, self.tokens - self.fail_cost)
+        if self.tokens < 1:
+            self._open_until = now + self.cooldown
+    
+    def record(self, status_code: int):
+        """Credit or debit the bucket based on an HTTP status code."""
+        if status_code == 429 or status_code >= 500:
+            self.on_fail()
+        else:
+            self.on_success()
+
+
+_BUCKETS = {
+    "yahoo": AdaptiveBucket(),
+    "alpha_vantage": AdaptiveBucket(),
+    "fmp": AdaptiveBucket(),
+    "polygon": AdaptiveBucket(),
+    "nasdaq": AdaptiveBucket(),
+}
+
+
+def _circuit_open(provider: str) -> bool:
+    """Return True (and log) when the provider's bucket is exhausted."""
+    if _BUCKETS[provider].allow():
+        return False
+    logger.warning(f"Circuit open for {provider}, skipping request")
+    return True
+
+
 class RealAPIStockFetcher:
     """
     Real API implementations for fetching stock data.
@@ -43,10 +174,10 @@ class RealAPIStockFetcher:
     """
     
     def __init__(self):
-        self.alpha_vantage_key = os.getenv("ALPHA_VANTAGE_API_KEY")
-        self.polygon_key = os.getenv("POLYGON_API_KEY")
-        self.fmp_key = os.getenv("FMP_API_KEY")
-        self.nasdaq_key = os.getenv("NASDAQ_DATA_LINK_KEY")
+        self.alpha_vantage_key = _ALPHA_VANTAGE_KEY
+        self.polygon_key = _POLYGON_KEY
+        self.fmp_key = _FMP_KEY
+        self.nasdaq_key = _NASDAQ_KEY
         self.ticker_fetch_limit = int(os.getenv("TICKER_FETCH_LIMIT", "50"))
         
         # Initialize sector ticker fetcher (will use ChromaDB if available)
@@ -75,20 +206,31 @@ class RealAPIStockFetcher:
             logger.error("yfinance not installed. Run: pip install yfinance")
             return []
         
+        if _circuit_open("yahoo"):
+            return []
+        
+        bucket = _BUCKETS["yahoo"]
+        
         # Map sector to stock tickers
-        sector_tickers = self._get_sector_tickers(sector)
+        sector_tickers = self._prep_tickers(sector)
+        if not sector_tickers:
+            return []
+        sector_name = sector.title()
         stocks = []
         
         for ticker in sector_tickers:
+            if _circuit_open("yahoo"):
+                break
             try:
                 stock_info = yf.Ticker(ticker)
                 info = stock_info.info
+                bucket.on_success()
                 
                 stock = Stock(
                     symbol=ticker,
                     name=info.get('longName', ticker),
                     price=info.get('currentPrice') or info.get('regularMarketPrice', 0),
-                    sector=sector.title(),
+                    sector=sector_name,
                     market_cap=info.get('marketCap'),
                     change=info.get('regularMarketChange'),
                     change_percent=info.get('regularMarketChangePercent')
@@ -97,6 +239,7 @@ class RealAPIStockFetcher:
                 logger.info(f"Fetched {ticker}: ${stock.price}")
                 
             except Exception as e:
+                bucket.on_fail()
                 logger.warning(f"Failed to fetch {ticker}: {e}")
                 continue
         
@@ -114,20 +257,30 @@ class RealAPIStockFetcher:
         Cons: Rate limits (5 calls/min on free tier)
         
         Sign up: https://www.alphavantage.co/support/#api-key
-        Install: pip install requests
+        Install: pip install httpx
         """
         if not self.alpha_vantage_key:
             logger.error("ALPHA_VANTAGE_API_KEY not set")
             return []
         
-        if not HAS_REQUESTS:
-            logger.error("requests not installed. Run: pip install requests")
+        if not HAS_HTTPX:
+            logger.error("httpx not installed. Run: pip install httpx")
+            return []
+        
+        if _circuit_open("alpha_vantage"):
             return []
         
-        sector_tickers = self._get_sector_tickers(sector)
+        bucket = _BUCKETS["alpha_vantage"]
+        sector_tickers = self._prep_tickers(sector)
+        if not sector_tickers:
+            return []
+        sector_name = sector.title()
+        client = _get_client()
         stocks = []
         
         for ticker in sector_tickers:
+            if _circuit_open("alpha_vantage"):
+                break
             try:
                 url = f"https://www.alphavantage.co/query"
                 params = {
@@ -136,25 +289,37 @@ class RealAPIStockFetcher:
                     "apikey": self.alpha_vantage_key
                 }
                 
-                response = requests.get(url, params=params)
+                response = await client.get(url, params=params)
+                bucket.record(response.status_code)
                 data = response.json()
                 
                 if "Global Quote" in data:
                     quote = data["Global Quote"]
-                    stock = Stock(
-                        symbol=ticker,
-                        name=ticker,  # Alpha Vantage doesn't provide company name in quote
-                        price=float(quote.get("05. price", 0)),
-                        sector=sector.title(),
-                        change=float(quote.get("09. change", 0)),
-                        change_percent=float(quote.get("10. change percent", "0").replace("%", ""))
-                    )
-                    stocks.append(stock)
-                    logger.info(f"Fetched {ticker}: ${stock.price}")
+                    try:
+                        price = float(quote["05. price"])
+                        change = float(quote["09. change"])
+                        change_percent = float(quote["10. change percent"].translate(_PERCENT_TRANS))
+                    except (KeyError, ValueError) as e:
+                        logger.warning(f"Malformed quote for {ticker}: {e}")
+                    else:
+                        stock = Stock(
+                            symbol=ticker,
+                            name=ticker,  # Alpha Vantage doesn't provide company name in quote
+                            price=price,
+                            sector=sector_name,
+                            change=change,
+                            change_percent=change_percent
+                        )
+                        stocks.append(stock)
+                        logger.info(f"Fetched {ticker}: ${stock.price}")
                 
                 # Rate limiting
                 await asyncio.sleep(12)  # Free tier: 5 calls/min
                 
+            except httpx.TransportError as e:
+                bucket.on_fail()
+                logger.warning(f"Failed to fetch {ticker}: {e}")
+                continue
             except Exception as e:
                 logger.warning(f"Failed to fetch {ticker}: {e}")
                 continue
@@ -178,6 +343,13 @@ class RealAPIStockFetcher:
             logger.error("FMP_API_KEY not set")
             return []
         
+        if not HAS_HTTPX:
+            logger.error("httpx not installed. Run: pip install httpx")
+            return []
+        
+        if _circuit_open("fmp"):
+            return []
+        
         try:
             # FMP has a sector screener endpoint
             url = f"https://financialmodelingprep.com/api/v3/stock-screener"
@@ -187,16 +359,18 @@ class RealAPIStockFetcher:
                 "apikey": self.fmp_key
             }
             
-            response = requests.get(url, params=params)
+            response = await _get_client().get(url, params=params)
+            _BUCKETS["fmp"].record(response.status_code)
             data = response.json()
             
             stocks = []
+            sector_name = sector.title()
             for item in data[:10]:  # Limit to 10 stocks
                 stock = Stock(
                     symbol=item.get("symbol", ""),
                     name=item.get("companyName", ""),
                     price=float(item.get("price", 0)),
-                    sector=sector.title(),
+                    sector=sector_name,
                     market_cap=item.get("marketCap"),
                     change=item.get("change"),
                     change_percent=item.get("changesPercentage")
@@ -205,6 +379,10 @@ class RealAPIStockFetcher:
             
             return stocks
             
+        except httpx.TransportError as e:
+            _BUCKETS["fmp"].on_fail()
+            logger.error(f"Failed to fetch from FMP: {e}")
+            return []
         except Exception as e:
             logger.error(f"Failed to fetch from FMP: {e}")
             return []
@@ -226,16 +404,31 @@ class RealAPIStockFetcher:
             logger.error("POLYGON_API_KEY not set")
             return []
         
-        sector_tickers = self._get_sector_tickers(sector)
+        if not HAS_HTTPX:
+            logger.error("httpx not installed. Run: pip install httpx")
+            return []
+        
+        if _circuit_open("polygon"):
+            return []
+        
+        bucket = _BUCKETS["polygon"]
+        sector_tickers = self._prep_tickers(sector)
+        if not sector_tickers:
+            return []
+        sector_name = sector.title()
+        client = _get_client()
         stocks = []
         
         for ticker in sector_tickers:
+            if _circuit_open("polygon"):
+                break
             try:
                 # Get previous day's data
                 url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/prev"
                 params = {"apiKey": self.polygon_key}
                 
-                response = requests.get(url, params=params)
+                response = await client.get(url, params=params)
+                bucket.record(response.status_code)
                 data = response.json()
                 
                 if data.get("results"):
@@ -243,22 +436,31 @@ class RealAPIStockFetcher:
                     
                     # Get company details
                     details_url = f"https://api.polygon.io/v3/reference/tickers/{ticker}"
-                    details_response = requests.get(details_url, params=params)
+                    details_response = await client.get(details_url, params=params)
+                    bucket.record(details_response.status_code)
                     details = details_response.json().get("results", {})
                     
+                    close = result.get("c", 0)
+                    open_ = result.get("o", 0)
+                    change = close - open_
+                    
                     stock = Stock(
                         symbol=ticker,
                         name=details.get("name", ticker),
-                        price=result.get("c", 0),  # Close price
-                        sector=sector.title(),
+                        price=close,  # Close price
+                        sector=sector_name,
                         market_cap=details.get("market_cap"),
-                        change=result.get("c", 0) - result.get("o", 0),
-                        change_percent=((result.get("c", 0) - result.get("o", 0)) / result.get("o", 1)) * 100
+                        change=change,
+                        change_percent=(change / open_) * 100 if open_ else 0
                     )
                     stocks.append(stock)
                 
                 await asyncio.sleep(0.1)  # Rate limiting
                 
+            except httpx.TransportError as e:
+                bucket.on_fail()
+                logger.warning(f"Failed to fetch {ticker}: {e}")
+                continue
             except Exception as e:
                 logger.warning(f"Failed to fetch {ticker}: {e}")
                 continue
@@ -282,30 +484,49 @@ class RealAPIStockFetcher:
             logger.error("NASDAQ_DATA_LINK_KEY not set")
             return []
         
+        if not HAS_HTTPX:
+            logger.error("httpx not installed. Run: pip install httpx")
+            return []
+        
+        if _circuit_open("nasdaq"):
+            return []
+        
+        bucket = _BUCKETS["nasdaq"]
+        
         # NASDAQ Data Link requires specific dataset codes
         # This is a simplified example
         try:
-            sector_tickers = self._get_sector_tickers(sector)
+            sector_tickers = self._prep_tickers(sector)
+            if not sector_tickers:
+                return []
+            sector_name = sector.title()
+            client = _get_client()
             stocks = []
             
             for ticker in sector_tickers:
+                if _circuit_open("nasdaq"):
+                    break
+                
                 # Example using WIKI prices (EOD data)
                 url = f"https://data.nasdaq.com/api/v3/datasets/WIKI/{ticker}.json"
                 params = {"api_key": self.nasdaq_key}
                 
-                response = requests.get(url, params=params)
+                response = await client.get(url, params=params)
+                bucket.record(response.status_code)
                 data = response.json()
                 
                 if "dataset" in data:
                     latest = data["dataset"]["data"][0]  # Most recent day
+                    close, open_ = latest[4], latest[1]
+                    change = close - open_
                     
                     stock = Stock(
                         symbol=ticker,
                         name=data["dataset"]["name"],
-                        price=latest[4],  # Close price
-                        sector=sector.title(),
-                        change=latest[4] - latest[1],  # Close - Open
-                        change_percent=((latest[4] - latest[1]) / latest[1]) * 100
+                        price=close,  # Close price
+                        sector=sector_name,
+                        change=change,  # Close - Open
+                        change_percent=(change / open_) * 100 if open_ else 0
                     )
                     stocks.append(stock)
                 
@@ -313,6 +534,10 @@ class RealAPIStockFetcher:
                 
             return stocks
             
+        except httpx.TransportError as e:
+            bucket.on_fail()
+            logger.error(f"Failed to fetch from NASDAQ Data Link: {e}")
+            return []
         except Exception as e:
             logger.error(f"Failed to fetch from NASDAQ Data Link: {e}")
             return []
@@ -338,7 +563,28 @@ class RealAPIStockFetcher:
                 limit=self.ticker_fetch_limit,
                 min_relevance=1.2  # Similarity threshold
             )
-            
+        
+        return []
+    
+    def _prep_tickers(self, sector: str) -> List[str]:
+        """Get de-duplicated tickers for a sector, preserving order."""
+        tickers = list(dict.fromkeys(self._get_sector_tickers(sector)))
+        if not tickers:
+            logger.info(f"No tickers for sector {sector}")
+        return tickers
+
+
+# Singleton instance
+_fetcher_instance = None
+
+
+def get_real_api_fetcher() -> RealAPIStockFetcher:
+    """Get or create the singleton RealAPIStockFetcher instance."""
+    global _fetcher_instance
+    if _fetcher_instance is None:
+        _fetcher_instance = RealAPIStockFetcher()
+    return _fetcher_instance
+
 
 # ============================================================
 # Example Usage
@@ -23,6 +23,28 @@ except ImportError as e:
 logger = logging.getLogger(__name__)
 
 
+# Hardcoded fallback tickers for common sectors
+_SECTOR_MAP = {
+    "technology": ("AAPL", "MSFT", "GOOGL", "NVDA", "META", "ORCL", "CRM", "ADBE", "INTC", "AMD"),
+    "healthcare": ("JNJ", "UNH", "PFE", "ABBV", "MRK", "TMO", "ABT", "LLY", "BMY", "AMGN"),
+    "finance": ("JPM", "BAC", "WFC", "GS", "MS", "C", "BLK", "SCHW", "AXP", "USB"),
+    "energy": ("XOM", "CVX", "COP", "SLB", "EOG", "PSX", "MPC", "VLO", "OXY", "KMI"),
+    "retail": ("WMT", "AMZN", "COST", "HD", "TGT", "LOW", "TJX", "DG", "DLTR", "BBY"),
+    "automotive": ("TSLA", "GM", "F", "TM", "HMC", "RIVN", "LCID", "STLA", "APTV", "BWA"),
+}
+
+# Yahoo sector labels the index builders store in each document's "sector" metadata,
+# keyed by the lowercase names users ask for
+_YAHOO_SECTORS = {
+    label.lower(): label for label in (
+        "Technology", "Healthcare", "Financial Services", "Energy",
+        "Consumer Cyclical", "Consumer Defensive", "Industrials",
+        "Basic Materials", "Real Estate", "Utilities", "Communication Services",
+    )
+}
+_YAHOO_SECTORS["finance"] = _YAHOO_SECTORS["financials"] = "Financial Services"
+
+
 class SectorTickerFetcher:
     """
     Fetches stock tickers for a given sector using ChromaDB semantic search.
@@ -60,8 +82,17 @@ class SectorTickerFetcher:
         Returns:
             List of stock ticker symbols
         """
+        # Normalize once; the helpers below expect a lowercase sector key
+        key = sector if sector.islower() else sector.lower()
+        
         if self.use_chroma:
-            return self._get_from_chroma(sector, limit, min_relevance)
+            return self._get_from_chroma(key, limit, min_relevance)
+        
+        return self._get_fallback(key, limit)
+    
+    def _get_fallback(self, sector: str, limit: int) -> List[str]:
+        """Get tickers from the hardcoded sector mappings (sector already lowercase)."""
+        return list(_SECTOR_MAP.get(sector, ())[:limit])
     
     def _get_from_chroma(
         self, 
@@ -82,15 +113,28 @@ class SectorTickerFetcher:
             # Get embeddings for the query
             query_embedding = embed_texts([query])[0]
             
-            # Search ChromaDB
-            results = collection.query(
-                query_embeddings=[query_embedding],
-                n_results=limit * 2,  # Get more results for filtering
-                include=["distances", "metadatas"]
-            )
+            # Known sectors search only documents tagged with the matching Yahoo label
+            results = None
+            label = _YAHOO_SECTORS.get(sector)
+            if label:
+                results = collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=limit,
+                    where={"sector": {"$eq": label}},
+                    include=["distances", "metadatas"]
+                )
+            
+            if not results or not results.get("ids") or not results["ids"][0]:
+                # Unknown sector, or an index built without sector metadata: search everything
+                results = collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=limit * 2,  # Get more results for filtering
+                    include=["distances", "metadatas"]
+                )
             
             if not results or not results.get("ids") or not results["ids"][0]:
                 logger.warning(f"No results from ChromaDB for sector: {sector}")
+                return self._get_fallback(sector, limit)
             
             # Filter by relevance and extract tickers
             tickers_set = set()
@@ -117,6 +161,8 @@ class SectorTickerFetcher:
                 
         except Exception as e:
             logger.error(f"Error querying ChromaDB: {e}")
+        
+        return self._get_fallback(sector, limit)
     
     def search_companies_by_query(
         self, 
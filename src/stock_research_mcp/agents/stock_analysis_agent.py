@@ -1,10 +1,34 @@
 """Stock Analysis Agent - Analyzes stocks with news, events, and price analysis."""
 
+import asyncio
 import logging
-from typing import List
-from datetime import datetime, timedelta
+import random
+import string
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, List, Optional
+from datetime import date, datetime, timedelta
 import json
 
+import numpy as np
+
+try:
+    import yfinance as yf
+    HAS_YFINANCE = True
+except ImportError:
+    yf = None
+    HAS_YFINANCE = False
+
+# One keep-alive session shared by every yfinance call so repeat requests skip
+# the TLS handshake. yfinance >= 0.2.5x only accepts curl_cffi sessions.
+try:
+    from curl_cffi import requests as curl_requests
+    _YF_SESSION = curl_requests.Session(impersonate="chrome")
+except ImportError:
+    _YF_SESSION = None
+
+from ..cache import get_file_cache, ttl_cache, NEWS_TTL, CALENDAR_TTL, DIVIDENDS_TTL, EMPTY_TTL
 from ..types import (
     Stock, 
     StockCategory, 
@@ -19,6 +43,195 @@ from ..types import (
 logger = logging.getLogger(__name__)
 
 
+# Maximum number of stocks analyzed concurrently
+MAX_CONCURRENT_ANALYSES = 16
+
+# Trend buckets on change_percent: values at a positive edge stay in the lower
+# bucket and values at a negative edge in the upper one (see _analyze_price_movement)
+_TREND_EDGES = np.array([-2.0, -0.5, 0.5, 2.0])
+_TRENDS = ("strong bearish", "bearish", "neutral", "bullish", "strong bullish")
+
+# Headline keywords for the simple sentiment heuristic. Matching is per whole token,
+# so headline inflections ("surges", "fell", ...) are listed alongside each base word.
+POSITIVE_WORDS = frozenset({
+    'surge', 'surges', 'surged', 'surging',
+    'gain', 'gains', 'gained', 'gaining',
+    'up',
+    'rise', 'rises', 'rose', 'risen', 'rising',
+    'jump', 'jumps', 'jumped', 'jumping',
+    'rally', 'rallies', 'rallied', 'rallying',
+    'upgrade', 'upgrades', 'upgraded',
+    'beat', 'beats', 'beating',
+    'strong', 'stronger', 'strongest',
+    'growth',
+    'profit', 'profits', 'profitable',
+    'success', 'successful',
+    'high', 'higher', 'highs',
+    'soar', 'soars', 'soared', 'soaring',
+    'boost', 'boosts', 'boosted',
+    'improve', 'improves', 'improved', 'improving',
+    'positive', 'bullish'
+})
+
+NEGATIVE_WORDS = frozenset({
+    'fall', 'falls', 'fell', 'fallen', 'falling',
+    'drop', 'drops', 'dropped', 'dropping',
+    'down',
+    'decline', 'declines', 'declined', 'declining',
+    'loss', 'losses',
+    'weak', 'weaker', 'weakens', 'weakened',
+    'miss', 'misses', 'missed',
+    'cut', 'cuts', 'cutting',
+    'downgrade', 'downgrades', 'downgraded',
+    'crash', 'crashes', 'crashed',
+    'plunge', 'plunges', 'plunged', 'plunging',
+    'concern', 'concerns',
+    'worry', 'worries', 'worried',
+    'negative', 'bearish',
+    'slump', 'slumps', 'slumped',
+    'struggle', 'struggles', 'struggled', 'struggling',
+    'warning', 'warnings', 'warns', 'warned'
+})
+
+# Maps punctuation to spaces so "surge," and "(up)" tokenize to bare words
+_PUNCT_TO_SPACE = str.maketrans(string.punctuation, " " * len(string.punctuation))
+
+# Dedicated pool for blocking yfinance calls, sized to Yahoo's practical request rate
+_YF_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="yfinance")
+
+# Concurrent Yahoo requests allowed before Yahoo starts answering HTTP 429
+MAX_CONCURRENT_YAHOO_CALLS = 8
+
+# Retries for rate-limited Yahoo calls, with exponential backoff between attempts
+YAHOO_MAX_ATTEMPTS = 5
+
+# Upper bound on one Yahoo call during an analysis, counted from when it gets a Yahoo
+# slot, so a slow upstream can't stall the batch
+ANALYSIS_TIMEOUT = 15.0
+
+# One semaphore per event loop; asyncio primitives can't be shared across loops
+_YF_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Whether a yfinance error is Yahoo throttling us (HTTP 429)."""
+    message = str(error)
+    return (
+        type(error).__name__ == "YFRateLimitError"
+        or "429" in message
+        or "Too Many Requests" in message
+    )
+
+
+def _call_yahoo(fn):
+    """Call a blocking yfinance accessor, backing off exponentially on HTTP 429."""
+    for attempt in range(YAHOO_MAX_ATTEMPTS):
+        try:
+            return fn()
+        except Exception as e:
+            if not _is_rate_limited(e) or attempt == YAHOO_MAX_ATTEMPTS - 1:
+                raise
+            # Jitter keeps concurrent callers from retrying in lockstep
+            delay = min(10.0, 0.5 * 2 ** attempt) + random.random() * 0.3
+            logger.warning(f"Yahoo rate limit hit, retrying in {delay:.1f}s (attempt {attempt + 1})")
+            time.sleep(delay)
+
+
+@ttl_cache(maxsize=1024, ttl=900)
+def _get_ticker(symbol: str):
+    """Get a shared yfinance Ticker for a symbol."""
+    return yf.Ticker(symbol, session=_YF_SESSION)
+
+
+@ttl_cache(maxsize=1024, ttl=900)
+def _get_info(symbol: str) -> dict:
+    """Get the (expensive to scrape) Ticker.info for a symbol."""
+    return _call_yahoo(lambda: _get_ticker(symbol).info)
+
+
+async def _run_blocking(fn, *args, timeout: Optional[float] = None):
+    """
+    Run a blocking yfinance call on the dedicated thread pool.
+    
+    timeout starts once the call holds a Yahoo slot, so time spent queued
+    behind other calls doesn't count. A call that times out (or whose caller
+    is cancelled) keeps its slot until the thread actually finishes, so
+    abandoned calls can't pile up in the pool.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _YF_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _YF_SEMAPHORES[loop] = asyncio.Semaphore(MAX_CONCURRENT_YAHOO_CALLS)
+    
+    await semaphore.acquire()
+    try:
+        fut = loop.run_in_executor(_YF_EXECUTOR, fn, *args)
+    except BaseException:
+        semaphore.release()
+        raise
+    
+    def _release(f):
+        semaphore.release()
+        if not f.cancelled():
+            f.exception()  # Mark retrieved; an abandoned call's error is not reported
+    
+    fut.add_done_callback(_release)
+    return await asyncio.wait_for(asyncio.shield(fut), timeout)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for per-stock analyses.
+    
+    CLOSED passes calls through. failure_threshold failures in a row trip it
+    OPEN, failing calls fast for reset_timeout seconds; it then goes HALF_OPEN
+    and lets half_open_max_calls trial calls through, closing again on a
+    success and reopening on a failure. Used only from the event loop, so no
+    locking is needed.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+    
+    def allow(self) -> bool:
+        """Whether a call may proceed now."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._half_open_calls = 0
+        
+        if self.state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                return False
+            self._half_open_calls += 1
+        return True
+    
+    def record_success(self):
+        self.state = self.CLOSED
+        self._failures = 0
+    
+    def record_failure(self):
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Analysis circuit open for {self.reset_timeout:.0f}s after {self._failures} failures")
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
 class StockAnalysisAgent:
     """
     Stock Analysis Agent
@@ -33,26 +246,40 @@ class StockAnalysisAgent:
     
     def __init__(self):
         self.name = "StockAnalysisAgent"
+        self.cache = get_file_cache()
     
-    async def analyze_stock(self, stock: Stock, category: StockCategory) -> AgentResult:
+    async def analyze_stock(
+        self,
+        stock: Stock,
+        category: StockCategory,
+        price_analysis: Optional[PriceAnalysis] = None,
+        now: Optional[datetime] = None
+    ) -> AgentResult:
         """
         Analyze a stock comprehensively.
         
         Args:
             stock: Stock object to analyze
             category: Stock category
+            price_analysis: Optional precomputed price analysis for the stock
+            now: Optional request timestamp shared across a batch
             
         Returns:
             AgentResult with StockAnalysis data
         """
         logger.info(f"[{self.name}] Analyzing stock: {stock.symbol}")
+        now = now or datetime.now()
         
         try:
-            # Perform parallel analysis
-            price_analysis = await self._analyze_price_movement(stock)
-            news = await self._fetch_stock_news(stock)
+            if price_analysis is None:
+                price_analysis = await self._analyze_price_movement(stock)
+            
+            # News and events are independent Yahoo round-trips, fetch them in parallel
+            news, events = await asyncio.gather(
+                self._fetch_stock_news(stock, now=now),
+                self._fetch_stock_events(stock, now=now)
+            )
             logger.info(f"Fetched {len(news)} news items for {stock.symbol}")
-            events = await self._fetch_stock_events(stock)
             logger.info(f"Fetched {len(events)} events for {stock.symbol}")
             
             # Generate recommendation
@@ -71,21 +298,29 @@ class StockAnalysisAgent:
             
             return AgentResult(
                 success=True,
-                data={"analysis": analysis.model_dump()},
-                timestamp=datetime.now()
+                data={"analysis": analysis},
+                timestamp=now
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"[{self.name}] Analysis of {stock.symbol} timed out after {ANALYSIS_TIMEOUT:.0f}s")
+            return AgentResult(
+                success=False,
+                error="Analysis timed out",
+                timestamp=now
             )
         except Exception as e:
             logger.error(f"[{self.name}] Failed to analyze stock: {e}")
             return AgentResult(
                 success=False,
                 error=f"Failed to analyze stock: {str(e)}",
-                timestamp=datetime.now()
+                timestamp=now
             )
     
     async def analyze_multiple_stocks(
         self,
         stocks: List[Stock],
-        get_category_fn
+        get_category_fn,
+        on_result: Optional[Callable[[StockAnalysis], Awaitable[None]]] = None
     ) -> AgentResult:
         """
         Analyze multiple stocks.
@@ -93,32 +328,87 @@ class StockAnalysisAgent:
         Args:
             stocks: List of stocks to analyze
             get_category_fn: Function to get category for a stock
+            on_result: Optional coroutine called with each successful analysis
+                in completion order, before the whole batch is done
             
         Returns:
-            AgentResult with list of StockAnalysis
+            AgentResult with list of StockAnalysis, plus the symbols that
+            failed, timed out or were skipped by the circuit breaker
         """
         logger.info(f"[{self.name}] Analyzing {len(stocks)} stocks")
+        now = datetime.now()
         
         try:
-            analyses = []
+            # Classify every stock in one vectorized pass
+            precomputed = dict(zip(
+                (s.symbol for s in stocks),
+                self._analyze_price_movement_batch(stocks)
+            ))
+            
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+            # Scoped to this batch so one bad request can't drop stocks from the next
+            breaker = CircuitBreaker()
+            
+            async def _bounded(stock: Stock) -> AgentResult:
+                async with semaphore:
+                    if not breaker.allow():
+                        return AgentResult(success=False, error="Analysis circuit open", timestamp=now)
+                    result = await self.analyze_stock(
+                        stock,
+                        get_category_fn(stock),
+                        price_analysis=precomputed.get(stock.symbol),
+                        now=now
+                    )
+                    if result.success:
+                        breaker.record_success()
+                    else:
+                        breaker.record_failure()
+                    return result
             
-            for stock in stocks:
-                category = get_category_fn(stock)
-                result = await self.analyze_stock(stock, category)
+            tasks = [asyncio.ensure_future(_bounded(stock)) for stock in stocks]
+            try:
+                if on_result is not None:
+                    for fut in asyncio.as_completed(tasks):
+                        try:
+                            result = await fut
+                        except Exception:
+                            continue  # Logged with the other failures below
+                        if result.success and result.data:
+                            try:
+                                await on_result(result.data["analysis"])
+                            except Exception as e:
+                                logger.warning(f"[{self.name}] Progress callback failed: {e}")
                 
-                if result.success and result.data:
+                # Already-finished tasks resolve immediately; results stay in input order
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            
+            analyses = []
+            dropped = []
+            for stock, result in zip(stocks, results):
+                if isinstance(result, BaseException):
+                    logger.warning(f"[{self.name}] Analysis failed for {stock.symbol}: {result}")
+                    dropped.append(stock.symbol)
+                elif result.success and result.data:
                     analyses.append(result.data["analysis"])
+                else:
+                    dropped.append(stock.symbol)
+            
+            if dropped:
+                logger.warning(f"[{self.name}] {len(dropped)} of {len(stocks)} stocks not analyzed: {', '.join(dropped)}")
             
             return AgentResult(
                 success=True,
-                data={"analyses": analyses},
-                timestamp=datetime.now()
+                data={"analyses": analyses, "dropped": dropped},
+                timestamp=now
             )
         except Exception as e:
             return AgentResult(
                 success=False,
                 error=f"Failed to analyze multiple stocks: {str(e)}",
-                timestamp=datetime.now()
+                timestamp=now
             )
     
     async def _analyze_price_movement(self, stock: Stock) -> PriceAnalysis:
@@ -132,44 +422,95 @@ class StockAnalysisAgent:
         - Determine trend direction
         """
         change_percent = stock.change_percent or 0
+        support = round(stock.price * 0.95, 2)
+        resistance = round(stock.price * 1.05, 2)
         
         # Determine trend
         if change_percent > 2:
-            trend = "strong bullish"
+            trend, trend_class = "strong bullish", 2
         elif change_percent > 0.5:
-            trend = "bullish"
+            trend, trend_class = "bullish", 1
         elif change_percent < -2:
-            trend = "strong bearish"
+            trend, trend_class = "strong bearish", -2
         elif change_percent < -0.5:
-            trend = "bearish"
+            trend, trend_class = "bearish", -1
         else:
-            trend = "neutral"
-        
-        support = round(stock.price * 0.95, 2)
-        resistance = round(stock.price * 1.05, 2)
+            trend, trend_class = "neutral", 0
         
         return PriceAnalysis(
             current_price=stock.price,
             trend=trend,
+            trend_class=trend_class,
             support=support,
             resistance=resistance
         )
     
-    async def _fetch_stock_news(self, stock: Stock) -> List[NewsItem]:
+    def _analyze_price_movement_batch(self, stocks: List[Stock]) -> List[PriceAnalysis]:
+        """
+        Price analysis for many stocks at once.
+        
+        Vectorized equivalent of _analyze_price_movement.
+        """
+        if not stocks:
+            return []
+        
+        prices = np.array([s.price for s in stocks], dtype=np.float64)
+        changes = np.array([s.change_percent or 0.0 for s in stocks], dtype=np.float64)
+        
+        idx = np.where(
+            changes > 0,
+            np.searchsorted(_TREND_EDGES, changes, side="left"),
+            np.searchsorted(_TREND_EDGES, changes, side="right")
+        )
+        supports = np.round(prices * 0.95, 2).tolist()
+        resistances = np.round(prices * 1.05, 2).tolist()
+        
+        return [
+            PriceAnalysis(
+                current_price=stock.price,
+                trend=_TRENDS[i],
+                trend_class=i - 2,
+                support=support,
+                resistance=resistance
+            )
+            for stock, i, support, resistance in zip(stocks, idx.tolist(), supports, resistances)
+        ]
+    
+    async def _fetch_stock_news(self, stock: Stock, now: Optional[datetime] = None) -> List[NewsItem]:
+        """
+        Fetch news for a stock from Yahoo Finance.
+        
+        yfinance is blocking, so the fetch runs in a worker thread.
+        """
+        return await _run_blocking(
+            self._fetch_stock_news_sync, stock, now or datetime.now(), timeout=ANALYSIS_TIMEOUT
+        )
+    
+    def _fetch_stock_news_sync(self, stock: Stock, now: datetime) -> List[NewsItem]:
         """
         Fetch news for a stock from Yahoo Finance.
         
         Uses yfinance library to get real news articles.
         """
+        if not HAS_YFINANCE:
+            logger.warning("yfinance not installed. Install with: pip install yfinance")
+            return []
+        
+        symbol = stock.symbol
+        
         try:
-            import yfinance as yf
-            
             # Fetch news from Yahoo Finance
-            ticker = yf.Ticker(stock.symbol)
-            news_items = ticker.news
+            news_items = self.cache.get(symbol, "news")
+            if news_items is None:
+                ticker = _get_ticker(symbol)
+                news_items = _call_yahoo(lambda: ticker.news) or []
+                self.cache.set(symbol, "news", news_items, ttl=NEWS_TTL if news_items else EMPTY_TTL)
             
             if not news_items:
-                logger.warning(f"No news found for {stock.symbol}")
+                logger.warning(f"No news found for {symbol}")
+            
+            # Fallback date for items without a timestamp, formatted once
+            today = now.strftime("%Y-%m-%d")
             
             # Convert Yahoo Finance news to NewsItem objects
             parsed_news = []
@@ -200,22 +541,21 @@ class StockAnalysisAgent:
                     )
                     
                     if timestamp:
-                        # Handle ISO format strings (e.g., "2025-11-27T14:00:00Z")
+                        # Handle ISO format strings (e.g., "2025-11-27T14:00:00Z"),
+                        # which already start with the YYYY-MM-DD date
                         if isinstance(timestamp, str):
-                            try:
-                                date = datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime("%Y-%m-%d")
-                            except:
-                                date = timestamp.split('T')[0]  # Fallback: just get date part
+                            date_str = timestamp[:10]
                         else:
                             # Handle Unix timestamp
-                            date = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+                            date_str = date.fromtimestamp(timestamp).isoformat()
                     else:
-                        date = datetime.now().strftime("%Y-%m-%d")
+                        date_str = today
                     
                     # Extract publisher/source
+                    publisher = content.get('publisher')
                     source = (
-                        content.get('publisher', {}).get('name') if isinstance(content.get('publisher'), dict) 
-                        else content.get('publisher') or 
+                        publisher.get('name') if isinstance(publisher, dict) 
+                        else publisher or 
                         item.get('publisher') or 
                         'Yahoo Finance'
                     )
@@ -223,7 +563,7 @@ class StockAnalysisAgent:
                     news_item = NewsItem(
                         title=title,
                         source=source,
-                        date=date,
+                        date=date_str,
                         sentiment=sentiment,
                         summary=summary[:200] if summary else ''
                     )
@@ -234,12 +574,11 @@ class StockAnalysisAgent:
                     logger.warning(f"Failed to parse news item: {parse_error}")
                     continue
             
-            return parsed_news if parsed_news else ""
+            return parsed_news
                     
-        except ImportError:
-            logger.warning("yfinance not installed. Install with: pip install yfinance")
         except Exception as e:
-            logger.warning(f"Failed to fetch news for {stock.symbol}: {e}")
+            logger.warning(f"Failed to fetch news for {symbol}: {e}")
+            return []
     
     def _analyze_sentiment(self, text: str) -> str:
         """
@@ -250,22 +589,9 @@ class StockAnalysisAgent:
         - VADER sentiment analyzer
         - Hugging Face transformers (FinBERT)
         """
-        text_lower = text.lower()
-        
-        positive_words = [
-            'surge', 'gain', 'up', 'rise', 'jump', 'rally', 'upgrade',
-            'beat', 'strong', 'growth', 'profit', 'success', 'high',
-            'soar', 'boost', 'improve', 'positive', 'bullish'
-        ]
-        
-        negative_words = [
-            'fall', 'drop', 'down', 'decline', 'loss', 'weak', 'miss',
-            'cut', 'downgrade', 'crash', 'plunge', 'concern', 'worry',
-            'negative', 'bearish', 'slump', 'struggle', 'warning'
-        ]
-        
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        tokens = text.lower().translate(_PUNCT_TO_SPACE).split()
+        positive_count = sum(1 for t in tokens if t in POSITIVE_WORDS)
+        negative_count = sum(1 for t in tokens if t in NEGATIVE_WORDS)
         
         if positive_count > negative_count:
             return "positive"
@@ -274,7 +600,17 @@ class StockAnalysisAgent:
         else:
             return "neutral"
         
-    async def _fetch_stock_events(self, stock: Stock) -> List[EventItem]:
+    async def _fetch_stock_events(self, stock: Stock, now: Optional[datetime] = None) -> List[EventItem]:
+        """
+        Fetch actual events for a stock from Yahoo Finance.
+        
+        yfinance is blocking, so the fetch runs in a worker thread.
+        """
+        return await _run_blocking(
+            self._fetch_stock_events_sync, stock, now or datetime.now(), timeout=ANALYSIS_TIMEOUT
+        )
+    
+    def _fetch_stock_events_sync(self, stock: Stock, now: datetime) -> List[EventItem]:
         """
         Fetch actual events for a stock from Yahoo Finance.
         
@@ -285,14 +621,21 @@ class StockAnalysisAgent:
         - Splits
         
         """
+        if not HAS_YFINANCE:
+            logger.warning("yfinance not installed. Install with: pip install yfinance")
+            return []
+        
+        symbol = stock.symbol
+        
         try:
-            import yfinance as yf
-            
             # Fetch calendar data from Yahoo Finance
-            ticker = yf.Ticker(stock.symbol)
-            calendar = ticker.calendar
+            ticker = _get_ticker(symbol)
+            calendar = self.cache.get(symbol, "calendar")
+            if calendar is None:
+                calendar = _call_yahoo(lambda: ticker.calendar) or {}
+                self.cache.set(symbol, "calendar", calendar, ttl=CALENDAR_TTL if calendar else EMPTY_TTL)
             
-            #logger.info(f"Fetched calendar for {stock.symbol}: {calendar})")
+            #logger.info(f"Fetched calendar for {symbol}: {calendar})")
             events = []
             
             # Extract earnings date
@@ -301,6 +644,9 @@ class StockAnalysisAgent:
                 if not isinstance(earnings_dates, (list, tuple)):
                     earnings_dates = [earnings_dates]
                 
+                # The calendar is cached for a quarter, so dates may have passed since
+                today = now.strftime("%Y-%m-%d")
+                
                 for i, earnings_date in enumerate(earnings_dates):
                     if earnings_date and str(earnings_date) != 'NaT':
                         try:
@@ -310,67 +656,79 @@ class StockAnalysisAgent:
                             else:
                                 date_str = str(earnings_date).split()[0]
                             
+                            if date_str < today:
+                                continue
+                            
                             events.append(EventItem(
                                 type="Earnings Report",
                                 date=date_str,
-                                description=f"{stock.symbol} earnings announcement",
+                                description=f"{symbol} earnings announcement",
                                 impact="high"
                             ))
-                            logger.info(f"Found earnings date for {stock.symbol}: {date_str}")
+                            logger.info(f"Found earnings date for {symbol}: {date_str}")
                         except Exception as e:
                             logger.warning(f"Could not parse earnings date: {e}")
             
             # Get dividend information
             try:
-                dividends = ticker.dividends
-                if dividends is not None and not dividends.empty:
-                    # Get the most recent dividend
-                    last_dividend = dividends.iloc[-1]
-                    last_dividend_date = dividends.index[-1]
+                last = self.cache.get(symbol, "dividends")
+                if last is None:
+                    dividends = _call_yahoo(lambda: ticker.dividends)
+                    last = {}
+                    if dividends is not None and not dividends.empty:
+                        # Keep only the most recent dividend, which is all we use
+                        last = {
+                            "date": dividends.index[-1].strftime("%Y-%m-%d"),
+                            "amount": float(dividends.iloc[-1]),
+                        }
+                    self.cache.set(symbol, "dividends", last, ttl=DIVIDENDS_TTL if last else EMPTY_TTL)
+                
+                if last:
+                    last_dividend = last["amount"]
+                    last_dividend_date = datetime.strptime(last["date"], "%Y-%m-%d")
                     
                     # Estimate next dividend date (typically quarterly)
                     next_dividend_date = last_dividend_date + timedelta(days=90)
                     
-                    if next_dividend_date > datetime.now():
+                    if next_dividend_date > now:
+                        date_str = next_dividend_date.strftime("%Y-%m-%d")
                         events.append(EventItem(
                             type="Dividend Payment",
-                            date=next_dividend_date.strftime("%Y-%m-%d"),
+                            date=date_str,
                             description=f"Expected quarterly dividend (last: ${last_dividend:.2f})",
                             impact="medium"
                         ))
-                        logger.info(f"Estimated next dividend for {stock.symbol}: {next_dividend_date.strftime('%Y-%m-%d')}")
+                        logger.info(f"Estimated next dividend for {symbol}: {date_str}")
             except Exception as e:
-                logger.debug(f"Could not fetch dividend info for {stock.symbol}: {e}")
+                logger.debug(f"Could not fetch dividend info for {symbol}: {e}")
             
             # Get ex-dividend date if available
             try:
-                info = ticker.info
+                info = _get_info(symbol)
                 if 'exDividendDate' in info and info['exDividendDate']:
                     ex_div_timestamp = info['exDividendDate']
                     ex_div_date = datetime.fromtimestamp(ex_div_timestamp)
                     
                     # Only include if it's in the future
-                    if ex_div_date > datetime.now():
+                    if ex_div_date > now:
+                        date_str = ex_div_date.strftime("%Y-%m-%d")
                         events.append(EventItem(
                             type="Ex-Dividend Date",
-                            date=ex_div_date.strftime("%Y-%m-%d"),
+                            date=date_str,
                             description="Last day to buy to receive dividend",
                             impact="medium"
                         ))
-                        logger.info(f"Found ex-dividend date for {stock.symbol}: {ex_div_date.strftime('%Y-%m-%d')}")
+                        logger.info(f"Found ex-dividend date for {symbol}: {date_str}")
             except Exception as e:
-                logger.debug(f"Could not fetch ex-dividend date for {stock.symbol}: {e}")
+                logger.debug(f"Could not fetch ex-dividend date for {symbol}: {e}")
             
-            # If we found real events, return them
-            if events:
-                return events
-            else:
-                logger.warning(f"No events found for {stock.symbol}")
+            if not events:
+                logger.warning(f"No events found for {symbol}")
+            return events
                 
-        except ImportError:
-            logger.warning("yfinance not installed. Install with: pip install yfinance")
         except Exception as e:
-            logger.warning(f"Failed to fetch events for {stock.symbol}: {e}")
+            logger.warning(f"Failed to fetch events for {symbol}: {e}")
+            return []
     
     def _generate_recommendation(
         self,
@@ -383,17 +741,24 @@ class StockAnalysisAgent:
         """Generate investment recommendation based on all analysis."""
         recommendation_parts = []
         
+        trend_class = price_analysis.trend_class
+        
         # Price trend analysis
-        if "bullish" in price_analysis.trend:
+        if trend_class > 0:
             recommendation_parts.append("Stock shows positive momentum.")
-        elif "bearish" in price_analysis.trend:
+        elif trend_class < 0:
             recommendation_parts.append("Stock is experiencing downward pressure.")
         else:
             recommendation_parts.append("Stock is trading sideways.")
         
-        # Sentiment analysis
-        positive_sentiment = sum(1 for n in news if n.sentiment == "positive")
-        negative_sentiment = sum(1 for n in news if n.sentiment == "negative")
+        # Sentiment analysis (single pass over news)
+        positive_sentiment = negative_sentiment = 0
+        for n in news:
+            sentiment = n.sentiment
+            if sentiment == "positive":
+                positive_sentiment += 1
+            elif sentiment == "negative":
+                negative_sentiment += 1
         
         if positive_sentiment > negative_sentiment:
             recommendation_parts.append("News sentiment is generally positive.")
@@ -415,17 +780,16 @@ class StockAnalysisAgent:
             )
         
         # Event considerations
-        high_impact_events = sum(1 for e in events if e.impact == "high")
-        if high_impact_events > 0:
+        if any(e.impact == "high" for e in events):
             recommendation_parts.append(
                 "Watch for upcoming high-impact events that could affect the stock price."
             )
         
         # Final recommendation
         overall_score = positive_sentiment - negative_sentiment
-        if "bullish" in price_analysis.trend:
+        if trend_class > 0:
             overall_score += 1
-        elif "bearish" in price_analysis.trend:
+        elif trend_class < 0:
             overall_score -= 1
         
         if overall_score > 1:
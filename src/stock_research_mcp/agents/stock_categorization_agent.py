@@ -4,12 +4,27 @@ import logging
 from typing import List
 from datetime import datetime
 
+import numpy as np
+
 from ..types import Stock, CategorizedStocks, StockCategory, AgentResult
 
 
 logger = logging.getLogger(__name__)
 
 
+# Bucket edges for np.digitize: code 0 = low (< $10), 1 = medium ($10 - $100
+# inclusive), 2 = high (> $100). The upper edge sits just above 100 so a price
+# of exactly $100 stays medium, matching get_category_for_stock.
+_CATEGORY_EDGES = np.array([10.0, np.nextafter(100.0, np.inf)])
+_CATEGORY_CODES = {StockCategory.LOW: 0, StockCategory.MEDIUM: 1, StockCategory.HIGH: 2}
+
+
+def _bucket_codes(stocks: tuple) -> np.ndarray:
+    """Return the category code (see _CATEGORY_EDGES) for each stock's price."""
+    prices = np.fromiter((s.price for s in stocks), dtype=np.float64, count=len(stocks))
+    return np.digitize(prices, _CATEGORY_EDGES)
+
+
 class StockCategorizationAgent:
     """
     Stock Categorization Agent
@@ -34,39 +49,42 @@ class StockCategorizationAgent:
         Returns:
             AgentResult with CategorizedStocks data
         """
-        logger.info(f"[{self.name}] Categorizing {len(stocks)} stocks")
+        logger.info("[%s] Categorizing %d stocks", self.name, len(stocks))
+        now = datetime.now()
         
         try:
-            categorized = CategorizedStocks()
-            
-            for stock in stocks:
-                if stock.price > 100:
-                    categorized.high.append(stock)
-                elif 10 <= stock.price <= 100:
-                    categorized.medium.append(stock)
-                else:
-                    categorized.low.append(stock)
+            stocks = tuple(stocks)
+            codes = _bucket_codes(stocks)
             
-            logger.info(
-                f"[{self.name}] Results: {len(categorized.high)} high, "
-                f"{len(categorized.medium)} medium, {len(categorized.low)} low"
+            # Each bucket is built once from its index array; the lists are
+            # known-valid Stock instances, so skip re-validation
+            categorized = CategorizedStocks.model_construct(
+                high=[stocks[i] for i in np.flatnonzero(codes == 2).tolist()],
+                medium=[stocks[i] for i in np.flatnonzero(codes == 1).tolist()],
+                low=[stocks[i] for i in np.flatnonzero(codes == 0).tolist()],
             )
             
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "[%s] Results: %d high, %d medium, %d low",
+                    self.name, len(categorized.high), len(categorized.medium), len(categorized.low)
+                )
+            
             return AgentResult(
                 success=True,
                 data={
-                    "high": [s.model_dump() for s in categorized.high],
-                    "medium": [s.model_dump() for s in categorized.medium],
-                    "low": [s.model_dump() for s in categorized.low],
+                    "high": [s.cached_dump for s in categorized.high],
+                    "medium": [s.cached_dump for s in categorized.medium],
+                    "low": [s.cached_dump for s in categorized.low],
                 },
-                timestamp=datetime.now()
+                timestamp=now
             )
         except Exception as e:
-            logger.error(f"[{self.name}] Failed to categorize stocks: {e}")
+            logger.error("[%s] Failed to categorize stocks: %s", self.name, e)
             return AgentResult(
                 success=False,
                 error=f"Failed to categorize stocks: {str(e)}",
-                timestamp=datetime.now()
+                timestamp=now
             )
     
     def get_category_for_stock(self, stock: Stock) -> StockCategory:
@@ -101,26 +119,24 @@ class StockCategorizationAgent:
         Returns:
             AgentResult with filtered stocks
         """
+        now = datetime.now()
         try:
-            result = await self.categorize_stocks(stocks)
-            
-            if not result.success or not result.data:
-                return AgentResult(
-                    success=False,
-                    error="Failed to categorize stocks",
-                    timestamp=datetime.now()
-                )
-            
-            filtered_stocks = result.data.get(category.value, [])
+            # Only the requested bucket is materialized and dumped
+            stocks = tuple(stocks)
+            codes = _bucket_codes(stocks)
+            filtered_stocks = [
+                stocks[i].cached_dump
+                for i in np.flatnonzero(codes == _CATEGORY_CODES[category]).tolist()
+            ]
             
             return AgentResult(
                 success=True,
                 data={"stocks": filtered_stocks},
-                timestamp=datetime.now()
+                timestamp=now
             )
         except Exception as e:
             return AgentResult(
                 success=False,
                 error=f"Failed to get stocks by category: {str(e)}",
-                timestamp=datetime.now()
+                timestamp=now
             )
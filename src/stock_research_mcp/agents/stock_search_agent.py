@@ -36,15 +36,15 @@ class StockSearchAgent:
         self.use_real_api = use_real_api
         
         if self.use_real_api:
-            logger.info(f"[{self.name}] Initialized with REAL API mode")
+            logger.info("[%s] Initialized with REAL API mode", self.name)
             try:
-                from .real_api_fetcher import RealAPIStockFetcher
-                self.api_fetcher = RealAPIStockFetcher()
+                from .real_api_fetcher import get_real_api_fetcher
+                self.api_fetcher = get_real_api_fetcher()
             except ImportError as e:
-                logger.warning(f"[{self.name}] Could not import real API fetcher: {e}")
+                logger.warning("[%s] Could not import real API fetcher: %s", self.name, e)
                 self.use_real_api = False
         else:
-            logger.info(f"[{self.name}] Could not find any data.")
+            logger.info("[%s] Could not find any data.", self.name)
     
     async def search_stocks_by_sector(self, sector: str) -> AgentResult:
         """
@@ -56,7 +56,10 @@ class StockSearchAgent:
         Returns:
             AgentResult with list of stocks
         """
-        logger.info(f"[{self.name}] Searching for stocks in sector: {sector}")
+        # Normalize at the boundary so downstream lookups can skip it
+        sector = sector.strip().lower()
+        logger.info("[%s] Searching for stocks in sector: %s", self.name, sector)
+        now = datetime.now()
         
         try:
             stocks = await self._fetch_stocks_from_source(sector)
@@ -64,22 +67,22 @@ class StockSearchAgent:
             if stocks:
                   return AgentResult(
                   success=True,
-                  data={"stocks": [stock.model_dump() for stock in stocks]},
-                  timestamp=datetime.now()
+                  data={"stocks": [stock.cached_dump for stock in stocks]},
+                  timestamp=now
                   )
             else:
-                logger.warning(f"[{self.name}] No stocks found for sector: {sector}")
+                logger.warning("[%s] No stocks found for sector: %s", self.name, sector)
                 return AgentResult(
                     success=False,
                     error=f"No stocks found for sector: {sector}",
-                    timestamp=datetime.now()
+                    timestamp=now
                 )
         except Exception as e:
-            logger.error(f"[{self.name}] Failed to search stocks: {e}")
+            logger.error("[%s] Failed to search stocks: %s", self.name, e)
             return AgentResult(
                 success=False,
                 error=f"Failed to search stocks: {str(e)}",
-                timestamp=datetime.now()
+                timestamp=now
             )
     
     async def _fetch_stocks_from_source(self, sector: str) -> List[Stock]:
@@ -96,20 +99,27 @@ class StockSearchAgent:
         if self.use_real_api:
             # Use real API (Yahoo Finance by default - free, no API key needed)
             try:
-                logger.info(f"[{self.name}] Fetching real data for sector: {sector}")
+                logger.info("[%s] Fetching real data for sector: %s", self.name, sector)
                 stocks = await self.api_fetcher.fetch_from_yahoo_finance(sector)
 
                 if stocks:
                     return stocks
                 else:
-                    logger.warning(f"[{self.name}] No real stocks found")
+                    logger.warning("[%s] No real stocks found", self.name)
             except Exception as e:
-                logger.error(f"[{self.name}] Real API failed: {e}")
+                logger.error("[%s] Real API failed: %s", self.name, e)
 
         return []
     
+    async def aclose(self):
+        """Close the pooled HTTP client shared by the real-API fetchers."""
+        if self.use_real_api:
+            from .real_api_fetcher import aclose
+            await aclose()
+    
     async def get_stock_details(self, symbol: str) -> AgentResult:
         """Get detailed information for a specific stock."""
+        now = datetime.now()
         try:
             # In production, fetch from API
             stock = Stock(
@@ -122,11 +132,11 @@ class StockSearchAgent:
             return AgentResult(
                 success=True,
                 data={"stock": stock.model_dump()},
-                timestamp=datetime.now()
+                timestamp=now
             )
         except Exception as e:
             return AgentResult(
                 success=False,
                 error=f"Failed to get stock details: {str(e)}",
-                timestamp=datetime.now()
+                timestamp=now
             )
@@ -3,9 +3,15 @@
 import os
 import sys
 import json
+import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import AsyncGenerator, Dict, Any, Optional
+from typing import AsyncGenerator, Dict, Any, List, Optional, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # Add sector directory to path
 sector_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "sector")
@@ -14,9 +20,9 @@ if os.path.exists(sector_path) and sector_path not in sys.path:
 
 try:
     from fetch_filings import download_best_filing
-    from extract_text import extract_business_section_from_file
     from embeddings_and_chroma import build_batch_records, CHROMA_PERSIST_DIR
     from fetch_tickers import fetch_sec_tickers
+    from yahoo_ticker_info import get_yahhoo_sector_info
     HAS_BUILDER = True
 except ImportError as e:
     HAS_BUILDER = False
@@ -26,6 +32,23 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Parsed tickers files keyed by path, reused while the file's mtime is unchanged
+_TICKERS_CACHE: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+
+
+def _load_tickers_file(path: str) -> List[Dict[str, Any]]:
+    """Load a tickers JSON file, reusing the parsed list if the file is unchanged."""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _TICKERS_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, "rb") as f:
+        raw = f.read()
+    tickers = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+    _TICKERS_CACHE[path] = (mtime, tickers)
+    return tickers
+
 
 class StreamingChromaBuilder:
     """
@@ -35,24 +58,31 @@ class StreamingChromaBuilder:
     def __init__(self):
         self.tickers_file = "tickers.json"
         self.sec_dir = "sec_filings"
-        self.max_workers = int(os.getenv("MAX_WORKERS", "4"))  # Reduced for better UX
-        self.batch_size = int(os.getenv("BATCH_SIZE", "32"))
+        self.max_workers = int(os.getenv("MAX_WORKERS", "8"))  # Concurrent downloads
+        self.batch_size = int(os.getenv("BATCH_SIZE", "128"))
+        self.index_queue_size = 4  # Batches buffered ahead of the indexer
     
     def is_chroma_db_built(self) -> bool:
         """Check if ChromaDB already exists and has data."""
         if not os.path.exists(CHROMA_PERSIST_DIR):
             return False
         
-        # Check if directory has ChromaDB files
+        # Common case: a single stat for the default sqlite store
+        if os.path.exists(os.path.join(CHROMA_PERSIST_DIR, "chroma.sqlite3")):
+            return True
+        
+        # Otherwise scan for any sqlite3 or parquet file, stopping at the first hit
         try:
-            files = os.listdir(CHROMA_PERSIST_DIR)
-            # Look for chroma.sqlite3 or parquet files
-            has_data = any(f.endswith(('.sqlite3', '.parquet')) for f in files)
-            return has_data
+            with os.scandir(CHROMA_PERSIST_DIR) as it:
+                return any(e.name.endswith(('.sqlite3', '.parquet')) for e in it)
         except Exception as e:
             logger.warning(f"Error checking ChromaDB: {e}")
             return False
     
+    async def is_chroma_db_built_async(self) -> bool:
+        """is_chroma_db_built() run in a worker thread, for use from async handlers."""
+        return await asyncio.to_thread(self.is_chroma_db_built)
+    
     async def build_with_streaming(self) -> AsyncGenerator[str, None]:
         """
         Build ChromaDB index with streaming progress updates.
@@ -80,38 +110,49 @@ class StreamingChromaBuilder:
             total_processed = 0
             total_successful = 0
             
-            # Process in batches with progress updates
-            with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
-                futures = {ex.submit(self._process_one, t): t for t in tickers}
-                
-                for fut in as_completed(futures):
-                    entry = futures[fut]
+            # Embedding/upserting runs in a background worker so downloads keep flowing
+            index_q: asyncio.Queue = asyncio.Queue(maxsize=self.index_queue_size)
+            indexer = asyncio.create_task(self._index_worker(index_q))
+            
+            # Downloads run concurrently in threads, bounded by a semaphore. They stay in
+            # this process so sec-edgar-downloader's rate limiter is shared by all of them
+            # and SEC's fair-access limit holds regardless of MAX_WORKERS.
+            semaphore = asyncio.Semaphore(self.max_workers)
+            tasks = [asyncio.create_task(self._process_one(t, semaphore)) for t in tickers]
+            
+            try:
+                for fut in asyncio.as_completed(tasks):
+                    res = await fut
                     total_processed += 1
                     
-                    try:
-                        res = fut.result()
-                        if res:
-                            to_index.append(res)
-                            total_successful += 1
-                            
-                            # Progress update every 10 companies
-                            if total_processed % 10 == 0:
-                                yield f"   📊 Progress: {total_processed}/{len(tickers)} processed, {total_successful} successful\n"
-                            
-                            # Build batch when ready
-                            if len(to_index) >= self.batch_size:
-                                yield f"   💾 Indexing batch of {len(to_index)} companies to ChromaDB...\n"
-                                build_batch_records(to_index)
-                                to_index = []
-                    except Exception as e:
-                        logger.error(f"Error processing {entry.get('ticker')}: {e}")
-            
-            # Index remaining
-            if to_index:
-                yield f"   💾 Indexing final batch of {len(to_index)} companies...\n"
-                build_batch_records(to_index)
+                    if res:
+                        to_index.append(res)
+                        total_successful += 1
+                        
+                        # Progress update every 10 companies
+                        if total_processed % 10 == 0:
+                            yield f"   📊 Progress: {total_processed}/{len(tickers)} processed, {total_successful} successful\n"
+                        
+                        # Hand off batch when ready (waits only if the indexer is behind)
+                        if len(to_index) >= self.batch_size:
+                            yield f"   💾 Indexing batch of {len(to_index)} companies to ChromaDB...\n"
+                            await index_q.put(to_index)
+                            to_index = []
+                
+                # Index remaining
+                if to_index:
+                    yield f"   💾 Indexing final batch of {len(to_index)} companies...\n"
+                    await index_q.put(to_index)
+                
+                await index_q.put(None)
+                total_indexed = await indexer
+            finally:
+                # Don't leave downloads or the indexer running if the consumer stops early
+                for task in tasks:
+                    task.cancel()
+                indexer.cancel()
             
-            yield f"\n✅ Step 2/4 Complete: Successfully indexed {total_successful} companies\n\n"
+            yield f"\n✅ Step 2/4 Complete: Successfully indexed {total_indexed} companies\n\n"
             
             # Step 3: Verify ChromaDB
             yield "🔍 Step 3/4: Verifying ChromaDB index...\n"
@@ -122,7 +163,7 @@ class StreamingChromaBuilder:
             
             # Step 4: Complete
             yield "🎉 Step 4/4: Build complete!\n"
-            yield f"📊 Total companies indexed: {total_successful}/{len(tickers)}\n"
+            yield f"📊 Total companies indexed: {total_indexed}/{len(tickers)}\n"
             yield f"💾 Database location: {CHROMA_PERSIST_DIR}\n"
             yield "\n✨ ChromaDB is now ready for semantic search!\n"
             yield "🔄 Proceeding with your original query...\n\n"
@@ -135,33 +176,61 @@ class StreamingChromaBuilder:
     async def _load_or_fetch_tickers(self):
         """Load tickers from cache or fetch from SEC."""
         if os.path.exists(self.tickers_file):
-            with open(self.tickers_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return _load_tickers_file(self.tickers_file)
         else:
             tickers = fetch_sec_tickers()
-            with open(self.tickers_file, "w", encoding="utf-8") as f:
-                json.dump(tickers, f, indent=2)
+            # Compact bytes output; the file is a cache, not meant for reading by hand
+            if HAS_ORJSON:
+                payload = orjson.dumps(tickers)
+            else:
+                payload = json.dumps(tickers, separators=(",", ":")).encode("utf-8")
+            with open(self.tickers_file, "wb") as f:
+                f.write(payload)
             return tickers
     
-    def _process_one(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    async def _index_worker(self, index_q: asyncio.Queue) -> int:
+        """Embed and upsert batches from the queue until a None sentinel arrives."""
+        indexed = 0
+        while True:
+            batch = await index_q.get()
+            if batch is None:
+                return indexed
+            try:
+                await asyncio.to_thread(build_batch_records, batch)
+                indexed += len(batch)
+            except Exception as e:
+                logger.error(f"Failed to index batch of {len(batch)} companies: {e}")
+    
+    async def _process_one(self, entry: Dict[str, Any], semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
         """Process a single company entry."""
         ticker = entry.get("ticker")
         cik = str(entry.get("cik_str"))
         id_for_download = ticker or cik
         
         try:
-            path = download_best_filing(id_for_download, out_dir=self.sec_dir)
-            if not path:
-                return None
-            
-            text = extract_business_section_from_file(path)
-            if not text or len(text) < 200:
-                return None
+            async with semaphore:
+                # download_best_filing is blocking and returns the extracted business section
+                text = await asyncio.to_thread(download_best_filing, id_for_download, out_dir=self.sec_dir)
+                if not text or len(text) < 200:
+                    return None
+                
+                # Same metadata as builder.py, so sector queries can filter on it
+                try:
+                    info = await asyncio.to_thread(get_yahhoo_sector_info, ticker)
+                except Exception as e:
+                    logger.debug(f"No sector info for {ticker}: {e}")
+                    info = {}
             
             return {
                 "id": ticker,
-                "text": text,
-                "meta": {"cik": cik, "title": entry.get("title")}
+                "documents": text,
+                "metadatas": {
+                    "ticker": ticker or "",
+                    "cik": cik,
+                    "title": entry.get("title") or "",
+                    "sector": info.get("sector") or "",
+                    "industry": info.get("industry") or ""
+                }
             }
         except Exception as e:
             logger.debug(f"Failed {ticker}: {e}")
@@ -0,0 +1,160 @@
+"""File-backed TTL cache for Yahoo Finance responses and sector reports."""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+
+# TTLs follow how often Yahoo refreshes each endpoint
+NEWS_TTL = 7 * 86400        # News refreshes daily, stale is fine within a session
+CALENDAR_TTL = 90 * 86400   # Earnings dates move quarterly
+DIVIDENDS_TTL = 90 * 86400  # Dividends are paid quarterly
+EMPTY_TTL = 3600            # Empty responses are often transient failures, retry them soon
+REPORT_TTL = 300            # Sector reports carry live quotes, no longer than the in-memory copy
+
+
+class FileCache:
+    """
+    Persistent TTL cache storing one JSON file per (symbol, endpoint).
+
+    Each file holds {"ts": epoch, "ttl": seconds, "data": ...} and is
+    named by the md5 of the symbol and endpoint.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, symbol: str, endpoint: str) -> str:
+        key = hashlib.md5(f"{symbol}:{endpoint}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, symbol: str, endpoint: str) -> Optional[Any]:
+        """Return cached data, or None if missing or expired."""
+        path = self._path(symbol, endpoint)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            entry = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        if time.time() - entry.get("ts", 0) > entry.get("ttl", 0):
+            return None
+        return entry.get("data")
+
+    def set(self, symbol: str, endpoint: str, data: Any, ttl: float):
+        """Store data for symbol/endpoint with the given TTL in seconds."""
+        path = self._path(symbol, endpoint)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entry = {"ts": time.time(), "ttl": ttl, "data": data}
+            if HAS_ORJSON:
+                payload = orjson.dumps(entry, default=str)
+            else:
+                payload = json.dumps(entry, default=str).encode("utf-8")
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            # Atomic rename so concurrent readers never see a partial file
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Failed to write cache entry {path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    def purge_expired(self) -> int:
+        """Delete expired (or unreadable) entries and return how many were removed."""
+        removed = 0
+        now = time.time()
+        try:
+            with os.scandir(self.cache_dir) as it:
+                paths = [e.path for e in it if e.name.endswith(".json")]
+        except FileNotFoundError:
+            return 0
+        
+        for path in paths:
+            try:
+                with open(path, "rb") as f:
+                    raw = f.read()
+                entry = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+                if now - entry.get("ts", 0) <= entry.get("ttl", 0):
+                    continue
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, AttributeError):
+                pass  # Unreadable, drop it too
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+def ttl_cache(maxsize: int = 1024, ttl: float = 900) -> Callable:
+    """
+    In-process LRU cache whose entries also expire after ttl seconds.
+
+    Thread-safe, since cached functions are called from worker threads.
+    The wrapped function gets a cache_clear() method like functools.lru_cache.
+    """
+    def decorator(fn: Callable) -> Callable:
+        entries: "OrderedDict[Any, tuple]" = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                hit = entries.get(args)
+                if hit is not None and now - hit[0] < ttl:
+                    entries.move_to_end(args)
+                    return hit[1]
+
+            value = fn(*args)
+
+            with lock:
+                entries[args] = (now, value)
+                entries.move_to_end(args)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return value
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+
+    return decorator
+
+
+# Singleton instance
+_cache_instance = None
+
+
+def get_file_cache() -> FileCache:
+    """Get or create the singleton FileCache instance."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = FileCache()
+    return _cache_instance
@@ -1,25 +1,46 @@
 """MCP Server for Stock Research - Main entry point."""
 
+import time
 import asyncio
 import logging
-from typing import Any
+from collections import OrderedDict, deque
+from datetime import date
+from typing import Any, Awaitable, Callable, Optional, TYPE_CHECKING
 
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
-from .agents import MultiAgentOrchestrator
-from .agents.streaming_builder import get_streaming_builder
+from .cache import REPORT_TTL, get_file_cache
+
+if TYPE_CHECKING:
+    from .agents import MultiAgentOrchestrator
+    from .agents.streaming_builder import StreamingChromaBuilder
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+RESULT_CACHE_TTL = 300  # Seconds a formatted sector report is reused
+RESULT_CACHE_SIZE = 64
+REPORT_SWEEP_INTERVAL = 3600  # Seconds between sweeps of expired on-disk cache entries
+
+_ANALYZE_SECTOR_DESC = """Comprehensive multi-agent stock analysis for a specific sector.
+
+This tool performs a three-stage analysis:
+1. Searches for all stocks in the specified sector
+2. Categorizes stocks into three groups:
+   - High-value: Price > $100
+   - Medium-value: Price $10-$100
+   - Low-value: Price < $10
+3. Provides detailed analysis for each stock including:
+   - Price trend analysis
+   - Recent news and sentiment
+   - Upcoming events
+   - Investment recommendation
+
+Example sectors: technology, healthcare, finance, energy, retail, automotive"""
+
 
 class StockResearchMCPServer:
     """
@@ -30,48 +51,60 @@ class StockResearchMCPServer:
     
     def __init__(self):
         self.server = Server("stock-research-mcp-server")
-        self.orchestrator = MultiAgentOrchestrator()
-        self.builder = get_streaming_builder()
-        self.chroma_checked = False
+        # Agents and the index builder pull in yfinance/numpy/chromadb, so they
+        # are created on the first tool call rather than at startup
+        self._orchestrator: Optional["MultiAgentOrchestrator"] = None
+        self._builder: Optional["StreamingChromaBuilder"] = None
+        # None until the first request probes the index; the lock makes concurrent
+        # first requests wait for a single probe/build instead of racing
+        self._chroma_ready: Optional[bool] = None
+        self._chroma_lock = asyncio.Lock()
         self.chroma_building = False
+        # Normalized sector -> (monotonic time, formatted report)
+        self._result_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._last_sweep = 0.0
+        # The tool list never changes, build it once instead of per list_tools call
+        self._tools = [
+            Tool(
+                name="analyze_sector",
+                description=_ANALYZE_SECTOR_DESC,
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "sector": {
+                            "type": "string",
+                            "description": "The sector to analyze (e.g., technology, healthcare, finance, energy)"
+                        }
+                    },
+                    "required": ["sector"]
+                }
+            )
+        ]
         self._setup_handlers()
     
+    @property
+    def orchestrator(self) -> "MultiAgentOrchestrator":
+        """Multi-agent orchestrator, created on first use."""
+        if self._orchestrator is None:
+            from .agents import MultiAgentOrchestrator
+            self._orchestrator = MultiAgentOrchestrator()
+        return self._orchestrator
+    
+    @property
+    def builder(self) -> "StreamingChromaBuilder":
+        """Streaming ChromaDB builder, created on first use."""
+        if self._builder is None:
+            from .agents.streaming_builder import get_streaming_builder
+            self._builder = get_streaming_builder()
+        return self._builder
+    
     def _setup_handlers(self):
         """Set up MCP request handlers."""
         
         @self.server.list_tools()
         async def handle_list_tools() -> list[Tool]:
             """List available tools."""
-            return [
-                Tool(
-                    name="analyze_sector",
-                    description="""Comprehensive multi-agent stock analysis for a specific sector.
-
-This tool performs a three-stage analysis:
-1. Searches for all stocks in the specified sector
-2. Categorizes stocks into three groups:
-   - High-value: Price > $100
-   - Medium-value: Price $10-$100
-   - Low-value: Price < $10
-3. Provides detailed analysis for each stock including:
-   - Price trend analysis
-   - Recent news and sentiment
-   - Upcoming events
-   - Investment recommendation
-
-Example sectors: technology, healthcare, finance, energy, retail, automotive""",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "sector": {
-                                "type": "string",
-                                "description": "The sector to analyze (e.g., technology, healthcare, finance, energy)"
-                            }
-                        },
-                        "required": ["sector"]
-                    }
-                )
-            ]
+            return self._tools
         
         @self.server.call_tool()
         async def handle_call_tool(
@@ -85,7 +118,7 @@ Example sectors: technology, healthcare, finance, energy, retail, automotive""",
                 else:
                     raise ValueError(f"Unknown tool: {name}")
             except Exception as e:
-                logger.error(f"Error handling tool call: {e}")
+                logger.error("Error handling tool call: %s", e)
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
         
     async def _handle_analyze_sector(self, arguments: dict[str, Any]) -> list[TextContent]:
@@ -95,38 +128,44 @@ Example sectors: technology, healthcare, finance, energy, retail, automotive""",
         if not sector:
             raise ValueError("Sector parameter is required")
         
-        logger.info(f"Processing sector analysis request for: {sector}")
+        logger.info("Processing sector analysis request for: %s", sector)
+        
+        key = sector.strip().lower()
+        cached = self._result_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < RESULT_CACHE_TTL:
+            logger.info("Serving cached analysis for: %s", key)
+            self._result_cache.move_to_end(key)
+            return [TextContent(type="text", text=cached[1])]
+        
+        # Second tier: a recent report for this sector from the on-disk cache,
+        # shared across restarts and processes
+        report_key = f"sector:{key}"
+        today = date.today().isoformat()
+        file_cache = get_file_cache()
+        report = await asyncio.to_thread(file_cache.get, report_key, today)
+        if report is not None:
+            logger.info("Serving cached report from disk for: %s", key)
+            self._remember_report(key, report)
+            return [TextContent(type="text", text=report)]
         
         output_parts = []
+        send_progress = self._progress_sender()
         
         # Check if ChromaDB needs to be built on first request
-        if not self.chroma_checked:
-            self.chroma_checked = True
-            
-            if not self.builder.is_chroma_db_built():
-                logger.info("ChromaDB not found. Building on first request...")
-                self.chroma_building = True
-                
-                # Stream build progress
-                build_output = []
-                build_output.append("\n" + "=" * 80)
-                build_output.append("📦 FIRST-TIME SETUP: BUILDING CHROMADB INDEX")
-                build_output.append("=" * 80)
-                build_output.append("\nℹ️  This is a one-time setup that runs on your first query.")
-                build_output.append("The database will be stored permanently for future use.\n")
-                
-                async for progress_msg in self.builder.build_with_streaming():
-                    build_output.append(progress_msg)
-                
-                build_output.append("\n" + "=" * 80 + "\n")
-                output_parts.append("".join(build_output))
-                
-                self.chroma_building = False
-            else:
-                logger.info("ChromaDB already exists, proceeding with query")
-        
-        # Execute multi-agent analysis
-        result = await self.orchestrator.process_sector_query(sector)
+        if self._chroma_ready is None:
+            async with self._chroma_lock:
+                if self._chroma_ready is None:
+                    self._chroma_ready = await self.builder.is_chroma_db_built_async()
+                    
+                    if not self._chroma_ready:
+                        output_parts.append(await self._build_chroma_index(send_progress))
+                        # Don't retry on later requests; a failed build falls back to hardcoded sectors
+                        self._chroma_ready = True
+                    else:
+                        logger.info("ChromaDB already exists, proceeding with query")
+        
+        # Execute multi-agent analysis, streaming each stock's block as it completes
+        result = await self.orchestrator.process_sector_query(sector, progress_callback=send_progress)
         
         if not result["success"]:
             error_msg = result.get("error", "Analysis failed")
@@ -136,28 +175,118 @@ Example sectors: technology, healthcare, finance, energy, retail, automotive""",
         formatted_output = self.orchestrator.format_results(result)
         output_parts.append(formatted_output)
         
+        self._remember_report(key, formatted_output)
+        # Only complete reports are persisted; a degraded one shouldn't outlive this process
+        if not result.get("dropped"):
+            await asyncio.to_thread(file_cache.set, report_key, today, formatted_output, REPORT_TTL)
+        
+        now = time.monotonic()
+        if now - self._last_sweep >= REPORT_SWEEP_INTERVAL:
+            self._last_sweep = now
+            removed = await asyncio.to_thread(file_cache.purge_expired)
+            logger.debug("Removed %d expired cache entries", removed)
+        
         return [TextContent(type="text", text="\n".join(output_parts))]
     
+    def _remember_report(self, key: str, report: str):
+        """Store a formatted report in the in-process LRU."""
+        self._result_cache[key] = (time.monotonic(), report)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
+    def _progress_sender(self) -> Optional[Callable[[str], Awaitable[None]]]:
+        """
+        Return a callback that sends MCP progress notifications for the current
+        request, or None if the client didn't send a progress token.
+        """
+        try:
+            ctx = self.server.request_context
+        except LookupError:
+            return None  # Not inside a request (e.g. called directly)
+        
+        progress_token = ctx.meta.progressToken if ctx.meta else None
+        if progress_token is None:
+            return None
+        
+        step = 0
+        
+        async def send(message: str):
+            nonlocal step
+            step += 1  # Progress must increase across the whole request
+            await ctx.session.send_progress_notification(progress_token, progress=step, message=message)
+        
+        return send
+    
+    async def _build_chroma_index(
+        self,
+        send_progress: Optional[Callable[[str], Awaitable[None]]] = None
+    ) -> str:
+        """
+        Build the ChromaDB index and return text for the tool response.
+        
+        With send_progress, each progress message is pushed as an MCP progress
+        notification as soon as it is produced, and only the tail of the build
+        log (totals or the error) is returned. Otherwise the full log is
+        returned as before.
+        """
+        logger.info("ChromaDB not found. Building on first request...")
+        self.chroma_building = True
+        
+        # Stream build progress
+        build_output = []
+        build_output.append("\n" + "=" * 80)
+        build_output.append("📦 FIRST-TIME SETUP: BUILDING CHROMADB INDEX")
+        build_output.append("=" * 80)
+        build_output.append("\nℹ️  This is a one-time setup that runs on your first query.")
+        build_output.append("The database will be stored permanently for future use.\n")
+        
+        progress_log = deque(maxlen=4) if send_progress is not None else build_output
+        
+        try:
+            async for progress_msg in self.builder.build_with_streaming():
+                progress_log.append(progress_msg)
+                if send_progress is not None:
+                    await send_progress(progress_msg.strip())
+        finally:
+            self.chroma_building = False
+        
+        if progress_log is not build_output:
+            build_output.extend(progress_log)
+        build_output.append("\n" + "=" * 80 + "\n")
+        return "".join(build_output)
+    
     async def run(self):
         """Run the MCP server."""
-        async with stdio_server() as (read_stream, write_stream):
-            logger.info("Stock Research MCP Server starting...")
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="stock-research-mcp-server",
-                    server_version="1.0.0",
-                    capabilities=self.server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={},
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                logger.info("Stock Research MCP Server starting...")
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="stock-research-mcp-server",
+                        server_version="1.0.0",
+                        capabilities=self.server.get_capabilities(
+                            notification_options=NotificationOptions(),
+                            experimental_capabilities={},
+                        )
                     )
                 )
-            )
+        finally:
+            # Only close what was actually created; don't build the orchestrator here
+            if self._orchestrator is not None:
+                await self._orchestrator.aclose()
 
 
 def main():
     """Main entry point."""
+    # Configure logging here rather than at import, so importing the module
+    # (tests, gradio) doesn't reconfigure the root logger
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     server = StockResearchMCPServer()
     asyncio.run(server.run())
 
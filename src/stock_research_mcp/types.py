@@ -2,7 +2,8 @@
 
 from typing import List, Optional, Literal
 from datetime import datetime
-from pydantic import BaseModel, Field
+from functools import cached_property
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 
@@ -15,6 +16,8 @@ class StockCategory(str, Enum):
 
 class Stock(BaseModel):
     """Stock data model."""
+    model_config = ConfigDict(frozen=True)
+    
     symbol: str
     name: str
     price: float
@@ -22,10 +25,17 @@ class Stock(BaseModel):
     market_cap: Optional[float] = None
     change: Optional[float] = None
     change_percent: Optional[float] = None
+    
+    @cached_property
+    def cached_dump(self) -> dict:
+        """model_dump() computed once per instance; treat the dict as read-only."""
+        return self.model_dump()
 
 
 class CategorizedStocks(BaseModel):
     """Categorized stocks by price range."""
+    model_config = ConfigDict(frozen=True)
+    
     high: List[Stock] = Field(default_factory=list)    # > $100
     medium: List[Stock] = Field(default_factory=list)  # $10 - $100
     low: List[Stock] = Field(default_factory=list)     # < $10
@@ -33,6 +43,8 @@ class CategorizedStocks(BaseModel):
 
 class NewsItem(BaseModel):
     """News item for a stock."""
+    model_config = ConfigDict(frozen=True)
+    
     title: str
     source: str
     date: str
@@ -42,6 +54,8 @@ class NewsItem(BaseModel):
 
 class EventItem(BaseModel):
     """Event item for a stock."""
+    model_config = ConfigDict(frozen=True)
+    
     type: str
     date: str
     description: str
@@ -50,14 +64,19 @@ class EventItem(BaseModel):
 
 class PriceAnalysis(BaseModel):
     """Price analysis data."""
+    model_config = ConfigDict(frozen=True)
+    
     current_price: float
     trend: str
+    trend_class: int = 0  # 2 strong bullish .. -2 strong bearish
     support: Optional[float] = None
     resistance: Optional[float] = None
 
 
 class StockAnalysis(BaseModel):
     """Complete stock analysis."""
+    model_config = ConfigDict(frozen=True)
+    
     stock: Stock
     category: StockCategory
     price_analysis: PriceAnalysis
@@ -68,6 +87,8 @@ class StockAnalysis(BaseModel):
 
 class AgentResult(BaseModel):
     """Generic agent result."""
+    model_config = ConfigDict(frozen=True)
+    
     success: bool
     data: Optional[dict] = None
     error: Optional[str] = None
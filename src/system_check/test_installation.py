@@ -19,17 +19,26 @@ async def test_agents():
     
     orchestrator = MultiAgentOrchestrator()
     
+    # The full orchestration (Test 4) doesn't depend on Tests 1-3, run it alongside them
+    search_result, full_result = await asyncio.gather(
+        orchestrator.search_agent.search_stocks_by_sector("technology"),
+        orchestrator.process_sector_query("healthcare")
+    )
+    
     # Test 1: Stock Search Agent
     print("\n✓ Test 1: Stock Search Agent")
-    search_result = await orchestrator.search_agent.search_stocks_by_sector("technology")
-    assert search_result.success, "Search agent failed"
+    if not search_result.success:
+        raise RuntimeError("Search agent failed")
     stocks = [Stock(**s) for s in search_result.data["stocks"]]
+    if not stocks:
+        raise RuntimeError("Search agent returned no stocks")
     print(f"  Found {len(stocks)} technology stocks")
     
     # Test 2: Stock Categorization Agent
     print("\n✓ Test 2: Stock Categorization Agent")
     categorize_result = await orchestrator.categorization_agent.categorize_stocks(stocks)
-    assert categorize_result.success, "Categorization agent failed"
+    if not categorize_result.success:
+        raise RuntimeError("Categorization agent failed")
     print(f"  High: {len(categorize_result.data['high'])} stocks")
     print(f"  Medium: {len(categorize_result.data['medium'])} stocks")
     print(f"  Low: {len(categorize_result.data['low'])} stocks")
@@ -39,21 +48,23 @@ async def test_agents():
     test_stock = stocks[0]
     category = orchestrator.categorization_agent.get_category_for_stock(test_stock)
     analysis_result = await orchestrator.analysis_agent.analyze_stock(test_stock, category)
-    assert analysis_result.success, "Analysis agent failed"
+    if not analysis_result.success:
+        raise RuntimeError("Analysis agent failed")
     print(f"  Analyzed {test_stock.symbol} successfully")
-    print(f"  Found {len(analysis_result.data['analysis']['news'])} news items")
-    print(f"  Found {len(analysis_result.data['analysis']['events'])} events")
+    print(f"  Found {len(analysis_result.data['analysis'].news)} news items")
+    print(f"  Found {len(analysis_result.data['analysis'].events)} events")
     
     # Test 4: Full Orchestration
     print("\n✓ Test 4: Multi-Agent Orchestration")
-    full_result = await orchestrator.process_sector_query("healthcare")
-    assert full_result["success"], "Orchestration failed"
+    if not full_result["success"]:
+        raise RuntimeError(f"Orchestration failed: {full_result.get('error')}")
     print(f"  Processed {full_result['total_stocks']} healthcare stocks")
     
     # Test 5: Output Formatting
     print("\n✓ Test 5: Output Formatting")
     formatted = orchestrator.format_results(full_result)
-    assert len(formatted) > 100, "Formatting failed"
+    if len(formatted) <= 100:
+        raise RuntimeError("Formatting failed")
     print(f"  Generated {len(formatted)} characters of formatted output")
     
     print("\n" + "=" * 60)
@@ -0,0 +1,61 @@
+"""Tests for the per-provider AdaptiveBucket in real_api_fetcher."""
+
+import pytest
+
+from stock_research_mcp.agents import real_api_fetcher
+from stock_research_mcp.agents.real_api_fetcher import AdaptiveBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(real_api_fetcher.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_drained_bucket_fails_fast(clock):
+    bucket = AdaptiveBucket()
+    for _ in range(4):
+        assert bucket.allow()
+        bucket.on_fail()
+    
+    assert not bucket.allow()
+    clock[0] += 0.01
+    assert not bucket.allow()
+    clock[0] += 10
+    assert not bucket.allow()
+
+
+def test_recovers_after_cooldown(clock):
+    bucket = AdaptiveBucket()
+    while bucket.allow():
+        bucket.on_fail()
+    
+    clock[0] += bucket.cooldown + 1
+    assert bucket.allow()
+    
+    # A failed trial call re-opens it immediately
+    bucket.on_fail()
+    assert not bucket.allow()
+
+
+def test_failures_spaced_by_rate_limit_sleep_still_trip(clock):
+    bucket = AdaptiveBucket()
+    calls = 0
+    while bucket.allow() and calls < 100:
+        bucket.on_fail()
+        calls += 1
+        clock[0] += 12  # Alpha Vantage's sleep between calls
+    assert calls < 10
+
+
+def test_record_maps_status_codes(clock):
+    bucket = AdaptiveBucket()
+    bucket.record(200)
+    assert bucket.tokens == bucket.capacity
+    bucket.record(429)
+    assert bucket.tokens == bucket.capacity - bucket.fail_cost
+    bucket.record(503)
+    assert bucket.tokens == bucket.capacity - 2 * bucket.fail_cost
+    bucket.record(404)
+    assert bucket.tokens == bucket.capacity - 2 * bucket.fail_cost + 1
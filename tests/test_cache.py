@@ -0,0 +1,172 @@
+"""Tests for the file-backed FileCache and how the analysis agent uses it."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from stock_research_mcp import cache
+from stock_research_mcp.cache import FileCache, EMPTY_TTL, NEWS_TTL
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+
+def _stored_ttl(file_cache: FileCache, symbol: str, endpoint: str) -> float:
+    with open(file_cache._path(symbol, endpoint), "rb") as f:
+        return json.loads(f.read())["ttl"]
+
+
+def test_get_returns_data_until_ttl_expires(tmp_path, clock):
+    file_cache = FileCache(str(tmp_path))
+    file_cache.set("AAPL", "news", [{"title": "x"}], ttl=60)
+    
+    assert file_cache.get("AAPL", "news") == [{"title": "x"}]
+    clock[0] += 60
+    assert file_cache.get("AAPL", "news") == [{"title": "x"}]
+    clock[0] += 1
+    assert file_cache.get("AAPL", "news") is None
+
+
+def test_missing_and_corrupt_entries_read_as_none(tmp_path):
+    file_cache = FileCache(str(tmp_path))
+    assert file_cache.get("AAPL", "news") is None
+    
+    with open(file_cache._path("AAPL", "news"), "w") as f:
+        f.write("{not json")
+    assert file_cache.get("AAPL", "news") is None
+
+
+def test_endpoints_are_cached_separately(tmp_path, clock):
+    file_cache = FileCache(str(tmp_path))
+    file_cache.set("AAPL", "news", [1], ttl=60)
+    file_cache.set("AAPL", "calendar", {"a": 1}, ttl=60)
+    
+    assert file_cache.get("AAPL", "news") == [1]
+    assert file_cache.get("AAPL", "calendar") == {"a": 1}
+
+
+@pytest.fixture
+def news_agent(tmp_path, monkeypatch):
+    from stock_research_mcp.agents import stock_analysis_agent
+    from stock_research_mcp.agents.stock_analysis_agent import StockAnalysisAgent
+    
+    agent = StockAnalysisAgent()
+    agent.cache = FileCache(str(tmp_path))
+    monkeypatch.setattr(stock_analysis_agent, "HAS_YFINANCE", True)
+    monkeypatch.setattr(stock_analysis_agent, "_get_ticker", lambda symbol: object())
+    return agent, stock_analysis_agent
+
+
+def _stock(symbol="AAPL"):
+    from stock_research_mcp.types import Stock
+    return Stock(symbol=symbol, name=symbol, price=150.0, sector="Technology")
+
+
+def test_empty_news_is_cached_with_short_ttl(news_agent, monkeypatch):
+    agent, module = news_agent
+    monkeypatch.setattr(module, "_call_yahoo", lambda fn: [])
+    
+    assert agent._fetch_stock_news_sync(_stock(), datetime.now()) == []
+    assert _stored_ttl(agent.cache, "AAPL", "news") == EMPTY_TTL
+
+
+def test_news_is_cached_with_full_ttl(news_agent, monkeypatch):
+    agent, module = news_agent
+    items = [{"content": {"title": "Nvidia surges", "summary": "s", "pubDate": "2025-11-27T14:00:00Z"}}]
+    monkeypatch.setattr(module, "_call_yahoo", lambda fn: items)
+    
+    news = agent._fetch_stock_news_sync(_stock(), datetime.now())
+    assert [n.title for n in news] == ["Nvidia surges"]
+    assert _stored_ttl(agent.cache, "AAPL", "news") == NEWS_TTL
+    
+    # Served from the cache without calling Yahoo again
+    monkeypatch.setattr(module, "_call_yahoo", lambda fn: pytest.fail("unexpected Yahoo call"))
+    assert [n.title for n in agent._fetch_stock_news_sync(_stock(), datetime.now())] == ["Nvidia surges"]
+
+
+def test_past_earnings_dates_are_skipped(news_agent, monkeypatch):
+    agent, module = news_agent
+    calendar = {"Earnings Date": ["2020-01-30", "2099-01-30"]}
+    monkeypatch.setattr(module, "_call_yahoo", lambda fn: calendar)
+    monkeypatch.setattr(module, "_get_info", lambda symbol: {})
+    
+    events = agent._fetch_stock_events_sync(_stock(), datetime(2025, 6, 1))
+    assert [e.date for e in events if e.type == "Earnings Report"] == ["2099-01-30"]
+
+
+@pytest.fixture
+def mono_clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_memoizes_until_expiry(mono_clock):
+    calls = []
+    
+    @cache.ttl_cache(maxsize=4, ttl=10)
+    def square(x):
+        calls.append(x)
+        return x * x
+    
+    assert square(3) == 9
+    assert square(3) == 9
+    assert calls == [3]
+    
+    mono_clock[0] += 10
+    assert square(3) == 9
+    assert calls == [3, 3]
+
+
+def test_ttl_cache_evicts_least_recently_used(mono_clock):
+    calls = []
+    
+    @cache.ttl_cache(maxsize=2, ttl=100)
+    def ident(x):
+        calls.append(x)
+        return x
+    
+    ident(1)
+    ident(2)
+    ident(1)  # 1 is now the most recently used
+    ident(3)  # Evicts 2
+    ident(1)
+    assert calls == [1, 2, 3]
+    ident(2)
+    assert calls == [1, 2, 3, 2]
+
+
+def test_ttl_cache_clear(mono_clock):
+    calls = []
+    
+    @cache.ttl_cache()
+    def ident(x):
+        calls.append(x)
+        return x
+    
+    ident(1)
+    ident.cache_clear()
+    ident(1)
+    assert calls == [1, 1]
+
+
+def test_purge_expired_removes_only_stale_entries(tmp_path, clock):
+    file_cache = FileCache(str(tmp_path))
+    file_cache.set("sector:technology", "2025-06-01", "report", ttl=300)
+    file_cache.set("AAPL", "news", [1], ttl=3600)
+    with open(tmp_path / "corrupt.json", "w") as f:
+        f.write("{not json")
+    
+    clock[0] += 301
+    assert file_cache.purge_expired() == 2
+    assert file_cache.get("AAPL", "news") == [1]
+    assert [str(p) for p in tmp_path.iterdir()] == [file_cache._path("AAPL", "news")]
+
+
+def test_purge_expired_without_cache_dir(tmp_path):
+    assert FileCache(str(tmp_path / "missing")).purge_expired() == 0
@@ -0,0 +1,37 @@
+"""Tests for the headline sentiment heuristic in StockAnalysisAgent."""
+
+import pytest
+
+from stock_research_mcp.agents.stock_analysis_agent import StockAnalysisAgent
+
+
+@pytest.fixture
+def agent():
+    return StockAnalysisAgent()
+
+
+@pytest.mark.parametrize("headline", [
+    "Nvidia surges after earnings",
+    "Apple beats estimates as iPhone sales jump",
+    "Shares rallied and gains continued",
+])
+def test_inflected_positive_headlines(agent, headline):
+    assert agent._analyze_sentiment(headline) == "positive"
+
+
+@pytest.mark.parametrize("headline", [
+    "Intel plunges on weak guidance",
+    "Tesla misses delivery targets, stock falls",
+    "Oil drops as demand worries grow",
+])
+def test_inflected_negative_headlines(agent, headline):
+    assert agent._analyze_sentiment(headline) == "negative"
+
+
+def test_substrings_do_not_match(agent):
+    # "update" contains "up", but only whole words count
+    assert agent._analyze_sentiment("Company issues product update") == "neutral"
+
+
+def test_punctuation_is_ignored(agent):
+    assert agent._analyze_sentiment("Nvidia (NVDA) surges, again!") == "positive"
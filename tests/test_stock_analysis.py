@@ -0,0 +1,109 @@
+"""Tests for the analysis agent's circuit breaker and drop/timeout accounting."""
+
+import asyncio
+import time
+
+import pytest
+
+from stock_research_mcp.agents import stock_analysis_agent
+from stock_research_mcp.agents.stock_analysis_agent import CircuitBreaker, StockAnalysisAgent
+from stock_research_mcp.types import Stock, StockCategory
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(stock_analysis_agent.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_breaker_opens_after_threshold_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_admits_one_trial_then_closes_or_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    
+    clock[0] += 30
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()  # Only one trial call
+    
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def _stocks(*symbols):
+    return [Stock(symbol=s, name=s, price=50.0, sector="Technology", change_percent=1.0) for s in symbols]
+
+
+def _agent(news_fn):
+    """An agent whose Yahoo fetches are replaced by news_fn and an empty event list."""
+    agent = StockAnalysisAgent()
+    agent._fetch_stock_news_sync = news_fn
+    agent._fetch_stock_events_sync = lambda stock, now: []
+    return agent
+
+
+def _analyze(agent, stocks):
+    result = asyncio.run(agent.analyze_multiple_stocks(stocks, lambda s: StockCategory.MEDIUM))
+    assert result.success
+    return [a.stock.symbol for a in result.data["analyses"]], result.data["dropped"]
+
+
+def test_timed_out_stock_is_reported_as_dropped(monkeypatch):
+    monkeypatch.setattr(stock_analysis_agent, "ANALYSIS_TIMEOUT", 0.1)
+    
+    def news(stock, now):
+        if stock.symbol == "SLOW":
+            time.sleep(0.5)
+        return []
+    
+    analyzed, dropped = _analyze(_agent(news), _stocks("AAA", "SLOW", "BBB"))
+    assert analyzed == ["AAA", "BBB"]
+    assert dropped == ["SLOW"]
+
+
+def test_open_breaker_drops_remaining_stocks_for_this_request_only(monkeypatch):
+    monkeypatch.setattr(stock_analysis_agent, "MAX_CONCURRENT_ANALYSES", 1)
+    calls = []
+    
+    def news(stock, now):
+        calls.append(stock.symbol)
+        raise RuntimeError("upstream down")
+    
+    agent = _agent(news)
+    symbols = [f"S{i}" for i in range(8)]
+    
+    analyzed, dropped = _analyze(agent, _stocks(*symbols))
+    assert analyzed == []
+    assert dropped == symbols
+    assert len(calls) == 5  # failure_threshold, then the rest fail fast
+    
+    # The next request starts with a fresh breaker
+    _analyze(agent, _stocks(*symbols))
+    assert len(calls) == 10